@@ -0,0 +1,70 @@
+"""
+Login burst benchmark: bcrypt verification inline on the event loop vs. on the password pool.
+
+Simulates LOGINS concurrent logins while a heartbeat probe ticks every HEARTBEAT_INTERVAL
+seconds on the same loop, and reports login throughput plus how late the heartbeats ran.
+
+    cd backend && python benchmarks/bench_password_hashing.py --logins 100
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+
+HEARTBEAT_INTERVAL = 0.05
+
+
+async def heartbeat_probe(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def inline_verify(password: str, hashed: str) -> bool:
+    return server.pwd_context.verify(password, hashed)
+
+
+async def run_burst(verify, logins: int, hashed: str):
+    stop = asyncio.Event()
+    lags = []
+    probe = asyncio.create_task(heartbeat_probe(stop, lags))
+    await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(verify("admin123", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "logins_per_second": round(logins / elapsed, 1),
+        "heartbeat_lag_p50_ms": round(statistics.median(lags_ms), 1),
+        "heartbeat_lag_max_ms": round(lags_ms[-1], 1),
+        "heartbeats_observed": len(lags),
+    }
+
+
+async def main(logins: int):
+    hashed = server.pwd_context.hash("admin123")
+    server.password_executor.max_queue = max(server.password_executor.max_queue, logins)
+
+    for label, verify in (("inline", inline_verify), ("pool", server.verify_password)):
+        result = await run_burst(verify, logins, hashed)
+        print(f"{label:>6}: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+
+    server.password_executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50, help="concurrent logins in the burst")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
@@ -0,0 +1,81 @@
+"""
+Per-row cost of returning a list endpoint: FastAPI's response_model path vs. the orjson fast path.
+
+The response_model path re-validates every document into the model, runs jsonable_encoder and
+json.dumps (what FastAPI does for `response_model=List[...]`); the fast path is TrustedJSONResponse.
+
+    cd backend && python benchmarks/bench_serialization.py --rows 1000
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+
+
+def make_entries(rows: int) -> List[dict]:
+    start = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+    entries = []
+    for i in range(rows):
+        begin = start + timedelta(hours=i)
+        entries.append({
+            "id": str(uuid.uuid4()),
+            "user_id": str(uuid.uuid4()),
+            "project_id": str(uuid.uuid4()),
+            "task_id": str(uuid.uuid4()),
+            "start_time": begin,
+            "end_time": begin + timedelta(minutes=45),
+            "duration": 45 * 60,
+            "entry_type": "timer",
+            "date": begin.date().isoformat(),
+            "notes": f"entry {i}",
+            "created_at": begin,
+        })
+    return entries
+
+
+def response_model_path(adapter: TypeAdapter, entries: List[dict]) -> bytes:
+    validated = adapter.validate_python(entries)
+    return json.dumps(jsonable_encoder(validated), separators=(",", ":")).encode()
+
+
+def fast_path(entries: List[dict]) -> bytes:
+    return server.TrustedJSONResponse(entries).body
+
+
+def per_row_us(fn, rows: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best / rows * 1e6
+
+
+def main(rows: int, repeat: int):
+    entries = make_entries(rows)
+    adapter = TypeAdapter(List[server.TimeEntry])
+
+    slow = per_row_us(lambda: response_model_path(adapter, entries), rows, repeat)
+    fast = per_row_us(lambda: fast_path(entries), rows, repeat)
+    print(f"rows={rows} best of {repeat}")
+    print(f"  response_model: {slow:8.2f} us/row")
+    print(f"  orjson fast:    {fast:8.2f} us/row  ({slow / fast:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="documents per response")
+    parser.add_argument("--repeat", type=int, default=20, help="runs; the best one is reported")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
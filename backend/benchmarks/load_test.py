@@ -0,0 +1,399 @@
+"""
+Reproducible API load test: seeds synthetic data, replays scripted workloads in-process and
+records p50/p95/p99 latency and throughput per endpoint.
+
+Runs against the MongoDB at MONGO_URL (a dedicated --db-name that is dropped and reseeded), or
+against mongomock_motor with --in-memory. Numbers from the two are not comparable; keep one
+baseline per setup.
+
+    cd backend && python benchmarks/load_test.py run --output benchmarks/baseline.json
+    cd backend && python benchmarks/load_test.py check --baseline benchmarks/baseline.json
+
+`check` exits with status 1 when any endpoint's p95 is more than --tolerance above the baseline.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+
+PASSWORD = "loadtest123"
+ADMIN_EMAIL = "admin@omnigratum.com"
+ADMIN_PASSWORD = "admin123"
+PERCENTILES = (50, 95, 99)
+
+
+class Recorder:
+    """Latency samples per endpoint label, plus the wall time each label was exercised for"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.wall: Dict[str, float] = {}
+
+    async def request(self, http: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await http.request(method, url, **kwargs)
+        self.samples.setdefault(label, []).append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] = self.errors.get(label, 0) + 1
+        return response
+
+    async def timed(self, labels: List[str], coroutines):
+        """Run a workload's requests concurrently and charge the elapsed time to its labels"""
+        started = time.perf_counter()
+        await asyncio.gather(*coroutines)
+        elapsed = time.perf_counter() - started
+        for label in labels:
+            self.wall[label] = self.wall.get(label, 0.0) + elapsed
+
+    def summary(self) -> Dict[str, dict]:
+        result = {}
+        for label, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            stats = {
+                "count": len(ordered),
+                "errors": self.errors.get(label, 0),
+                "throughput_rps": round(len(ordered) / self.wall[label], 1) if self.wall.get(label) else None,
+            }
+            for pct in PERCENTILES:
+                index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+                stats[f"p{pct}_ms"] = round(ordered[index] * 1000, 2)
+            result[label] = stats
+        return result
+
+
+async def seed(args) -> dict:
+    """Deterministic users, projects, tasks, a year of time entries and some notifications"""
+    rng = random.Random(args.seed)
+    db = server.db
+    hashed = await server.hash_password(PASSWORD)
+    admin = await db.users.find_one({"role": server.UserRole.ADMIN.value}, {"_id": 0})
+
+    users = []
+    for i in range(args.users):
+        user = server.User(
+            id=str(uuid.UUID(int=rng.getrandbits(128))),
+            email=f"employee{i}@loadtest.example.com",
+            name=f"Employee {i}",
+            role=server.UserRole.EMPLOYEE,
+            status=server.UserStatus.ACTIVE
+        )
+        users.append({**server.to_document(user), "password": hashed})
+    await db.users.insert_many(users)
+
+    projects, tasks = [], []
+    for i in range(args.projects):
+        project = server.Project(
+            id=str(uuid.UUID(int=rng.getrandbits(128))),
+            name=f"Project {i}",
+            created_by=admin['id']
+        )
+        projects.append(server.to_document(project))
+        for j in range(args.tasks):
+            task = server.Task(
+                id=str(uuid.UUID(int=rng.getrandbits(128))),
+                name=f"Task {i}.{j}",
+                project_id=project.id
+            )
+            tasks.append(server.to_document(task))
+    await db.projects.insert_many(projects)
+    await db.tasks.insert_many(tasks)
+
+    year_start = datetime.combine(args.end_date - timedelta(days=364), datetime.min.time(), tzinfo=timezone.utc)
+    for offset in range(0, args.entries, server.IMPORT_BATCH_SIZE):
+        batch = []
+        for _ in range(min(server.IMPORT_BATCH_SIZE, args.entries - offset)):
+            task = rng.choice(tasks)
+            start = year_start + timedelta(days=rng.randrange(365), hours=rng.randint(7, 17), minutes=rng.randrange(60))
+            duration = rng.randint(5, 240) * 60
+            entry = server.TimeEntry(
+                id=str(uuid.UUID(int=rng.getrandbits(128))),
+                user_id=rng.choice(users)['id'],
+                project_id=task['project_id'],
+                task_id=task['id'],
+                start_time=start,
+                end_time=start + timedelta(seconds=duration),
+                duration=duration,
+                entry_type=rng.choice(list(server.EntryType)),
+                date=start.date().isoformat(),
+                created_at=start
+            )
+            batch.append(server.to_document(entry))
+        await db.time_entries.insert_many(batch)
+        await server.apply_rollup_deltas(batch)
+    # Seeded rollups are complete, so the app reads them rather than raw entries
+    await server.mark_rollups_backfilled()
+
+    notifications = []
+    for user in users:
+        for i in range(args.notifications):
+            notification = server.Notification(
+                id=str(uuid.UUID(int=rng.getrandbits(128))),
+                user_id=user['id'],
+                type=server.NotificationType.TIMESHEET_APPROVED,
+                title="Timesheet Approved",
+                message=f"Load test notification {i}",
+                read=rng.random() < 0.5
+            )
+            notifications.append(notification)
+    if notifications:
+        await server.insert_notifications(notifications)
+
+    return {"admin": admin, "users": users, "tasks": tasks}
+
+
+async def login(recorder: Recorder, http: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await recorder.request(http, "POST /auth/login", "POST", "/api/auth/login", json={
+        "email": email, "password": password
+    })
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+async def login_burst(recorder, http, data, args):
+    emails = [user['email'] for user in data['users']]
+    await recorder.timed(["POST /auth/login"], [
+        login(recorder, http, emails[i % len(emails)], PASSWORD) for i in range(args.logins)
+    ])
+
+
+async def heartbeat_storm(recorder, http, data, args):
+    """Every employee runs a timer and heartbeats concurrently, then stops it"""
+    headers = data['employee_headers']
+    tasks = data['tasks']
+
+    async def start(i, auth):
+        task = tasks[i % len(tasks)]
+        await recorder.request(http, "POST /timer/start", "POST", "/api/timer/start", headers={
+            **auth, "Idempotency-Key": str(uuid.uuid4())
+        }, json={"project_id": task['project_id'], "task_id": task['id']})
+
+    async def beat(auth):
+        for _ in range(args.heartbeats):
+            await recorder.request(http, "POST /timer/heartbeat", "POST", "/api/timer/heartbeat", headers=auth)
+
+    async def stop(auth):
+        await recorder.request(http, "POST /timer/stop", "POST", "/api/timer/stop", headers={
+            **auth, "Idempotency-Key": str(uuid.uuid4())
+        }, json={"notes": "load test"})
+
+    await recorder.timed(["POST /timer/start"], [start(i, auth) for i, auth in enumerate(headers)])
+    await recorder.timed(["POST /timer/heartbeat"], [beat(auth) for auth in headers])
+    await server.heartbeat_coalescer.flush()
+    await recorder.timed(["POST /timer/stop"], [stop(auth) for auth in headers])
+
+
+async def notification_polling(recorder, http, data, args):
+    """What NotificationContext does when the stream is down: unread count plus the latest page"""
+    async def poll(auth):
+        for _ in range(args.polls):
+            await recorder.request(http, "GET /notifications/unread-count", "GET", "/api/notifications/unread-count", headers=auth)
+            await recorder.request(http, "GET /notifications", "GET", "/api/notifications", headers=auth, params={"limit": 20})
+
+    await recorder.timed(
+        ["GET /notifications/unread-count", "GET /notifications"],
+        [poll(auth) for auth in data['employee_headers']]
+    )
+
+
+def report_params(args, days: int) -> dict:
+    return {"start_date": (args.end_date - timedelta(days=days - 1)).isoformat(), "end_date": args.end_date.isoformat()}
+
+
+async def reports(recorder, http, data, args):
+    admin = data['admin_headers']
+
+    async def report(group_by):
+        for _ in range(args.reports):
+            await recorder.request(http, "GET /reports/time", "GET", "/api/reports/time", headers=admin, params={
+                **report_params(args, 365), "group_by": group_by
+            })
+
+    async def dashboard(auth):
+        await recorder.request(http, "GET /dashboard/stats", "GET", "/api/dashboard/stats", headers=auth)
+
+    await recorder.timed(["GET /reports/time"], [report(group_by) for group_by in server.REPORT_GROUPINGS])
+    await recorder.timed(["GET /dashboard/stats"], [dashboard(auth) for auth in [admin, *data['employee_headers']]])
+
+
+async def exports(recorder, http, data, args):
+    admin = data['admin_headers']
+
+    async def export(kind):
+        for _ in range(args.exports):
+            await recorder.request(http, f"GET /reports/export/{kind}", "GET", f"/api/reports/export/{kind}", headers=admin, params=report_params(args, 90))
+
+    await recorder.timed(["GET /reports/export/csv"], [export("csv")])
+    await recorder.timed(["GET /reports/export/pdf"], [export("pdf")])
+
+
+WORKLOADS = {
+    "login_burst": login_burst,
+    "heartbeat_storm": heartbeat_storm,
+    "notification_polling": notification_polling,
+    "reports": reports,
+    "exports": exports,
+}
+
+
+def use_database(args):
+    """Point the server module at the benchmark database before the app starts"""
+    if args.db_name == server.DB_NAME and not args.in_memory:
+        sys.exit(f"refusing to drop the application database {args.db_name!r}; pass another --db-name")
+    if args.in_memory:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("--in-memory needs mongomock-motor: pip install mongomock-motor")
+        server.client = AsyncMongoMockClient(tz_aware=True)
+        server.db = server.reports_db = server.client[args.db_name]
+        return
+    server.connect_mongo()
+    read_preference = server.reports_db.read_preference
+    server.db = server.client[args.db_name]
+    server.reports_db = server.client.get_database(args.db_name, read_preference=read_preference)
+
+
+# Workloads that need server-side features mongomock does not implement ($round in reports)
+IN_MEMORY_UNSUPPORTED = {"reports"}
+
+
+async def run_workloads(args) -> dict:
+    use_database(args)
+    if args.in_memory:
+        skipped = [name for name in args.workloads if name in IN_MEMORY_UNSUPPORTED]
+        if skipped:
+            print(f"skipping {', '.join(skipped)}: not supported by mongomock")
+        args.workloads = [name for name in args.workloads if name not in IN_MEMORY_UNSUPPORTED]
+    await server.client.drop_database(args.db_name)
+    server.password_executor.max_queue = max(server.password_executor.max_queue, args.logins, args.users)
+
+    # Only what the workloads need from startup: mongomock has no partial indexes or $indexStats
+    if not args.in_memory:
+        await server.ensure_indexes()
+    await server.init_default_admin()
+    try:
+        seed_started = time.perf_counter()
+        data = await seed(args)
+        seed_seconds = time.perf_counter() - seed_started
+
+        recorder = Recorder()
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as http:
+            data['admin_headers'] = await login(recorder, http, ADMIN_EMAIL, ADMIN_PASSWORD)
+            data['employee_headers'] = await asyncio.gather(*(
+                login(recorder, http, user['email'], PASSWORD) for user in data['users']
+            ))
+            recorder.samples.clear()
+            recorder.errors.clear()
+
+            for name in args.workloads:
+                await WORKLOADS[name](recorder, http, data, args)
+    finally:
+        server.password_executor.shutdown()
+        server.pdf_executor.shutdown()
+        server.close_mongo()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "backend": "mongomock" if args.in_memory else "mongod",
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "users": args.users,
+            "projects": args.projects,
+            "tasks_per_project": args.tasks,
+            "entries": args.entries,
+            "workloads": args.workloads,
+            "seed_seconds": round(seed_seconds, 2),
+        },
+        "endpoints": recorder.summary(),
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float, floor_ms: float) -> List[str]:
+    """Endpoints whose p95 grew past the tolerance, or that started failing"""
+    regressions = []
+    for label, before in baseline['endpoints'].items():
+        after = current['endpoints'].get(label)
+        if after is None:
+            continue
+        allowed = max(before['p95_ms'] * (1 + tolerance), before['p95_ms'] + floor_ms)
+        if after['p95_ms'] > allowed:
+            regressions.append(f"{label}: p95 {before['p95_ms']}ms -> {after['p95_ms']}ms (allowed {allowed:.2f}ms)")
+        if after['errors'] > before['errors']:
+            regressions.append(f"{label}: errors {before['errors']} -> {after['errors']}")
+    return regressions
+
+
+def print_summary(result: dict):
+    print(f"{'endpoint':<34} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    for label, stats in result['endpoints'].items():
+        print(
+            f"{label:<34} {stats['count']:>6} {stats['errors']:>4} {stats['p50_ms']:>9} "
+            f"{stats['p95_ms']:>9} {stats['p99_ms']:>9} {stats['throughput_rps'] or '-':>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="seed, run the workloads and write the results")
+    run.add_argument("--output", type=Path, help="write results as JSON here (a new baseline)")
+    check = subparsers.add_parser("check", help="run and compare against a baseline; exit 1 on regression")
+    check.add_argument("--baseline", type=Path, required=True)
+    check.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95 growth")
+    check.add_argument("--floor-ms", type=float, default=5.0, help="allowed absolute p95 growth, for fast endpoints")
+
+    for sub in (run, check):
+        sub.add_argument("--in-memory", action="store_true", help="use mongomock_motor instead of MONGO_URL")
+        sub.add_argument("--db-name", default="time_tracking_loadtest", help="database to drop and seed")
+        sub.add_argument("--seed", type=int, default=42)
+        sub.add_argument("--users", type=int, default=50)
+        sub.add_argument("--projects", type=int, default=10)
+        sub.add_argument("--tasks", type=int, default=5, help="tasks per project")
+        sub.add_argument("--entries", type=int, default=20000, help="time entries spread over a year")
+        sub.add_argument("--notifications", type=int, default=20, help="notifications per user")
+        sub.add_argument("--end-date", type=date.fromisoformat, default=date(2025, 12, 31), help="last day of seeded data")
+        sub.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+        sub.add_argument("--logins", type=int, default=100, help="logins in the burst")
+        sub.add_argument("--heartbeats", type=int, default=10, help="heartbeats per running timer")
+        sub.add_argument("--polls", type=int, default=5, help="polling rounds per user")
+        sub.add_argument("--reports", type=int, default=3, help="report requests per grouping")
+        sub.add_argument("--exports", type=int, default=2, help="requests per export format")
+
+    args = parser.parse_args()
+    result = asyncio.run(run_workloads(args))
+    print_summary(result)
+
+    if args.command == "run":
+        if args.output:
+            args.output.write_text(json.dumps(result, indent=2) + "\n")
+            print(f"results written to {args.output}")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline['meta'].get('backend') != result['meta']['backend']:
+        print(f"warning: baseline was recorded against {baseline['meta'].get('backend')}")
+    regressions = compare(baseline, result, args.tolerance, args.floor_ms)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
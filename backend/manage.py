@@ -0,0 +1,104 @@
+"""
+Maintenance commands for the time tracking backend.
+
+    python manage.py rebuild-rollups [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD]
+    python manage.py migrate-datetimes [--batch-size N] [--pause SECONDS] [--restart]
+"""
+import argparse
+import asyncio
+import logging
+
+from pymongo import UpdateOne
+
+import server
+
+
+async def rebuild_rollups(args):
+    await server.ensure_indexes()
+    await server.rebuild_daily_rollups(args.start_date, args.end_date)
+    if not args.start_date and not args.end_date:
+        # A full rebuild also satisfies the startup backfill
+        await server.mark_rollups_backfilled()
+    logging.info("daily_rollups rebuilt")
+
+
+async def migrate_collection_datetimes(name: str, fields: tuple, batch_size: int, pause: float, restart: bool):
+    """Convert ISO-string timestamps to BSON dates in _id order, checkpointing after each batch"""
+    checkpoint_id = server.datetime_migration_id(name)
+    if restart:
+        await server.db.migrations.delete_one({"_id": checkpoint_id})
+    checkpoint = await server.db.migrations.find_one({"_id": checkpoint_id}) or {}
+    if checkpoint.get("done"):
+        logging.info(f"{name}: already migrated")
+        return
+
+    query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    last_id = checkpoint.get("last_id")
+    converted = checkpoint.get("converted", 0)
+
+    while True:
+        batch_query = {**query, "_id": {"$gt": last_id}} if last_id is not None else query
+        docs = await server.db[name].find(
+            batch_query, {field: 1 for field in fields}
+        ).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not docs:
+            break
+
+        operations = []
+        for doc in docs:
+            strings = {field: doc[field] for field in fields if isinstance(doc.get(field), str)}
+            # Matching on the old strings means a concurrent write to the same field wins
+            operations.append(UpdateOne(
+                {"_id": doc["_id"], **strings},
+                {"$set": {field: server.as_datetime(value) for field, value in strings.items()}}
+            ))
+        result = await server.db[name].bulk_write(operations, ordered=False)
+
+        last_id = docs[-1]["_id"]
+        converted += result.modified_count
+        await server.db.migrations.update_one(
+            {"_id": checkpoint_id},
+            {"$set": {"last_id": last_id, "converted": converted}},
+            upsert=True
+        )
+        logging.info(f"{name}: {converted} documents converted")
+        if pause:
+            await asyncio.sleep(pause)
+
+    await server.db.migrations.update_one({"_id": checkpoint_id}, {"$set": {"done": True}}, upsert=True)
+    logging.info(f"{name}: done, {converted} documents converted")
+
+
+async def migrate_datetimes(args):
+    for name, fields in server.DATETIME_FIELDS.items():
+        await migrate_collection_datetimes(name, fields, args.batch_size, args.pause, args.restart)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time tracking maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rollups = subparsers.add_parser("rebuild-rollups", help="Recompute daily_rollups from time_entries")
+    rollups.add_argument("--start-date", help="first date to rebuild (YYYY-MM-DD), default: all")
+    rollups.add_argument("--end-date", help="last date to rebuild (YYYY-MM-DD), default: all")
+    rollups.set_defaults(func=rebuild_rollups)
+
+    datetimes = subparsers.add_parser(
+        "migrate-datetimes",
+        help="Convert ISO-string timestamps to native BSON dates (online, resumable)"
+    )
+    datetimes.add_argument("--batch-size", type=int, default=500, help="documents per bulk write")
+    datetimes.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    datetimes.add_argument("--restart", action="store_true", help="ignore saved checkpoints and rescan")
+    datetimes.set_defaults(func=migrate_datetimes)
+
+    args = parser.parse_args()
+    server.connect_mongo()
+    try:
+        asyncio.run(args.func(args))
+    finally:
+        server.close_mongo()
+
+
+if __name__ == "__main__":
+    main()
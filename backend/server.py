@@ -1,45 +1,549 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status
+from fastapi import FastAPI, APIRouter, BackgroundTasks, Depends, File, Header, HTTPException, Query, Request, UploadFile, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel, ReturnDocument, UpdateOne, ASCENDING, DESCENDING, monitoring
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure, PyMongoError
 import os
+import socket
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, ValidationError
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
 import jwt
+import orjson
 from enum import Enum
 import io
+import csv
+import json
+import re
+import base64
+import asyncio
+import multiprocessing
+import bisect
+import random
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer
 from reportlab.lib.units import inch
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics, exposed in Prometheus text format on the internal /metrics endpoint
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+EVENT_LOOP_LAG_INTERVAL_SECONDS = float(os.environ.get('EVENT_LOOP_LAG_INTERVAL_SECONDS', '1'))
+REQUEST_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class Histogram:
+    """Cumulative-bucket latency histogram in seconds"""
+    
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+class RequestMetrics:
+    """Request counts per route template and status, latency per route template"""
+    
+    def __init__(self):
+        self.requests: Counter = Counter()
+        self.latency: Dict[tuple, Histogram] = {}
+    
+    def observe(self, method: str, route: str, status_code: int, seconds: float):
+        self.requests[(method, route, status_code)] += 1
+        histogram = self.latency.get((method, route))
+        if histogram is None:
+            histogram = self.latency[(method, route)] = Histogram(REQUEST_LATENCY_BUCKETS)
+        histogram.observe(seconds)
+    
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP http_requests_total Requests handled, by route template and status",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status_code), count in sorted(self.requests.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status_code}"}} {count}')
+        lines += [
+            "# HELP http_request_duration_seconds Time from request to last response byte",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.latency.items()):
+            lines += histogram.render("http_request_duration_seconds", f'method="{method}",route="{route}"')
+        return lines
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request against the route template it matched"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+        
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            request_metrics.observe(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - started
+            )
+
+def command_collection(command_name: str, command: dict) -> str:
+    """Collection a command targets, or "" for database-level commands"""
+    if command_name == "getMore":
+        return str(command.get("collection", ""))
+    target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Per-collection, per-command MongoDB round-trip timings (called from driver threads)"""
+    
+    def __init__(self):
+        self.latency: Dict[tuple, Histogram] = {}
+        self.failures: Counter = Counter()
+        self._targets: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+    
+    def started(self, event):
+        with self._lock:
+            self._targets[(event.connection_id, event.request_id)] = (event.database_name, command_collection(event.command_name, event.command))
+    
+    def _finish(self, event) -> tuple:
+        # Completion events do not carry the database or the command document
+        database, collection = self._targets.pop((event.connection_id, event.request_id), ("", ""))
+        return (database, collection, event.command_name)
+    
+    def succeeded(self, event):
+        with self._lock:
+            key = self._finish(event)
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(FAST_LATENCY_BUCKETS)
+            histogram.observe(event.duration_micros / 1e6)
+    
+    def failed(self, event):
+        with self._lock:
+            self.failures[self._finish(event)] += 1
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            latency = sorted((key, histogram) for key, histogram in self.latency.items())
+            failures = sorted(self.failures.items())
+        lines = [
+            "# HELP mongodb_command_duration_seconds MongoDB command round trips, by collection and command",
+            "# TYPE mongodb_command_duration_seconds histogram",
+        ]
+        for (database, collection, command), histogram in latency:
+            lines += histogram.render(
+                "mongodb_command_duration_seconds",
+                f'database="{database}",collection="{collection}",command="{command}"'
+            )
+        lines += [
+            "# HELP mongodb_command_failures_total MongoDB commands that returned an error",
+            "# TYPE mongodb_command_failures_total counter",
+        ]
+        for (database, collection, command), count in failures:
+            lines.append(
+                f'mongodb_command_failures_total{{database="{database}",collection="{collection}",command="{command}"}} {count}'
+            )
+        return lines
+
+class EventLoopLagMonitor:
+    """Measures how long a ready callback waits for the event loop"""
+    
+    def __init__(self):
+        self.histogram = Histogram(FAST_LATENCY_BUCKETS)
+        self.last = 0.0
+    
+    async def probe(self):
+        started = time.perf_counter()
+        await asyncio.sleep(0)
+        self.last = time.perf_counter() - started
+        self.histogram.observe(self.last)
+    
+    def render(self) -> List[str]:
+        return [
+            "# HELP event_loop_lag_seconds Delay before a ready callback runs, sampled periodically",
+            "# TYPE event_loop_lag_seconds histogram",
+            *self.histogram.render("event_loop_lag_seconds", 'loop="main"'),
+            "# HELP event_loop_lag_last_seconds Most recent event loop lag sample",
+            "# TYPE event_loop_lag_last_seconds gauge",
+            f"event_loop_lag_last_seconds {self.last}",
+        ]
+
+request_metrics = RequestMetrics()
+mongo_command_metrics = MongoCommandMetrics()
+event_loop_monitor = EventLoopLagMonitor()
+
+# Slow query recorder: commands over the threshold are kept in a ring buffer, a sample is explained
+SLOW_QUERY_ENABLED = os.environ.get('SLOW_QUERY_ENABLED', 'true').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '100'))
+SLOW_QUERY_BUFFER_SIZE = int(os.environ.get('SLOW_QUERY_BUFFER_SIZE', '200'))
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', '0.1'))
+# Flag plans that examine this many documents per document returned
+SLOW_QUERY_EXAMINED_RATIO_WARNING = float(os.environ.get('SLOW_QUERY_EXAMINED_RATIO_WARNING', '100'))
+
+def query_shape(value):
+    """Replace literal values with "?" keeping operators, field names and $field paths"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            return [query_shape(item) for item in value]
+        return "?"
+    if isinstance(value, str) and value.startswith("$"):
+        return value
+    return "?"
+
+def summarize_explain(explain: dict) -> Dict[str, Any]:
+    """Stages, COLLSCAN flag and examined/returned counts from an executionStats explain"""
+    stages = []
+    stats = []
+    
+    def walk(node):
+        if isinstance(node, dict):
+            if isinstance(node.get("stage"), str):
+                stages.append(node["stage"])
+            if isinstance(node.get("executionStats"), dict):
+                stats.append(node["executionStats"])
+            for key, item in node.items():
+                if key not in ("rejectedPlans", "allPlansExecution"):
+                    walk(item)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+    
+    walk(explain)
+    docs_examined = sum(stat.get("totalDocsExamined", 0) for stat in stats)
+    keys_examined = sum(stat.get("totalKeysExamined", 0) for stat in stats)
+    returned = stats[0].get("nReturned", 0) if stats else 0
+    ratio = round(docs_examined / max(returned, 1), 1)
+    return {
+        "stages": list(dict.fromkeys(stages)),
+        "collscan": "COLLSCAN" in stages,
+        "docs_examined": docs_examined,
+        "keys_examined": keys_examined,
+        "returned": returned,
+        "examined_per_returned": ratio,
+        "high_examined_ratio": ratio >= SLOW_QUERY_EXAMINED_RATIO_WARNING,
+        "execution_ms": stats[0].get("executionTimeMillis") if stats else None,
+    }
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    """Keeps the last slow commands with their query shape and, for a sample, their explain plan"""
+    
+    # Read commands that can be re-run under explain without side effects
+    EXPLAINABLE = {"find", "aggregate", "count", "distinct"}
+    SHAPE_FIELDS = ("filter", "sort", "projection", "pipeline", "query", "key")
+    # Driver-added fields that explain rejects or that belong to the original session
+    DRIVER_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"}
+    
+    def __init__(self, threshold_ms: float, buffer_size: int, sample_rate: float):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.records = deque(maxlen=buffer_size)
+        self.total = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._explaining = False
+        self._pending: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+    
+    def started(self, event):
+        if event.command_name == "explain":
+            return
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+    
+    def succeeded(self, event):
+        self._finish(event, None)
+    
+    def failed(self, event):
+        self._finish(event, str(event.failure.get("errmsg", "")))
+    
+    def _finish(self, event, error: Optional[str]):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is None or duration_ms < self.threshold_ms:
+            return
+        
+        database, command = pending
+        # Sort and projection are structure, not literals, so they are kept verbatim
+        shape = {
+            field: command[field] if field in ("sort", "projection", "key") else query_shape(command[field])
+            for field in self.SHAPE_FIELDS if field in command
+        }
+        for statements in ("updates", "deletes"):
+            if command.get(statements):
+                shape["q"] = query_shape(command[statements][0].get("q", {}))
+        record = {
+            "at": datetime.now(timezone.utc),
+            "database": database,
+            "collection": command_collection(event.command_name, command),
+            "command": event.command_name,
+            "duration_ms": round(duration_ms, 1),
+            "shape": shape,
+            "error": error,
+            "plan": None,
+        }
+        with self._lock:
+            self.records.append(record)
+            self.total += 1
+        
+        if self.should_explain(event.command_name, command):
+            self._explaining = True
+            try:
+                self.loop.call_soon_threadsafe(asyncio.ensure_future, self.explain(record, database, command))
+            except RuntimeError:
+                # The loop is closed (shutdown)
+                self._explaining = False
+    
+    def should_explain(self, command_name: str, command: dict) -> bool:
+        if command_name not in self.EXPLAINABLE or self.loop is None or self._explaining:
+            return False
+        if any("$out" in stage or "$merge" in stage for stage in command.get("pipeline", [])):
+            return False
+        return random.random() < self.sample_rate
+    
+    async def explain(self, record: dict, database: str, command: dict):
+        """Re-run the command under explain("executionStats") and attach a plan summary"""
+        try:
+            explained = {
+                key: value for key, value in command.items()
+                if not key.startswith("$") and key not in self.DRIVER_FIELDS
+            }
+            result = await client[database].command({"explain": explained, "verbosity": "executionStats"})
+            record["plan"] = summarize_explain(result)
+        except Exception as e:
+            record["plan"] = {"error": str(e)}
+        finally:
+            self._explaining = False
+    
+    def recent(self, limit: int) -> List[dict]:
+        with self._lock:
+            records = list(self.records)
+        return records[::-1][:limit]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "explain_sample_rate": self.sample_rate,
+            "buffer_size": self.records.maxlen,
+            "buffered": len(self.records),
+            "total": self.total,
+        }
+
+slow_query_recorder = SlowQueryRecorder(SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_BUFFER_SIZE, SLOW_QUERY_EXPLAIN_SAMPLE_RATE)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+DB_NAME = os.environ['DB_NAME']
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '0')) or None
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '0')) or None
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '30000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '20000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '0')) or None
+# Comma-separated wire compressors in order of preference (zstd, snappy, zlib); empty disables
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', '')
+
+# Reports and exports read through their own read preference so they can be served by secondaries
+REPORTS_READ_PREFERENCE = os.environ.get('REPORTS_READ_PREFERENCE', 'secondaryPreferred')
+REPORTS_MAX_STALENESS_SECONDS = int(os.environ.get('REPORTS_MAX_STALENESS_SECONDS', '120'))  # MongoDB minimum is 90
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+# Created per worker process at startup (connect_mongo), never at import, so forked workers
+# do not share sockets or pool state
+client: Optional[AsyncIOMotorClient] = None
+db = None
+reports_db = None
+
+def connect_mongo():
+    """Create this process's client and database handles; no-op if already connected"""
+    global client, db, reports_db
+    if client is not None:
+        return
+    
+    options = {
+        # tz_aware: BSON dates come back as timezone-aware UTC datetimes
+        "tz_aware": True,
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "event_listeners": [
+            listener for listener, enabled in ((mongo_command_metrics, METRICS_ENABLED), (slow_query_recorder, SLOW_QUERY_ENABLED))
+            if enabled
+        ],
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    client = AsyncIOMotorClient(mongo_url, **options)
+    db = client[DB_NAME]
+    
+    read_preference = READ_PREFERENCES[REPORTS_READ_PREFERENCE]
+    if read_preference is Primary:
+        reports_db = db
+    else:
+        reports_db = client.get_database(DB_NAME, read_preference=read_preference(max_staleness=REPORTS_MAX_STALENESS_SECONDS))
+
+def close_mongo():
+    global client, db, reports_db
+    if client is not None:
+        client.close()
+    client = db = reports_db = None
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt runs on a dedicated thread pool; logins beyond the wait-queue limit get a 503
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '4'))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', '200'))
+
 # JWT settings
 SECRET_KEY = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production-123')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Authenticated user cache
+USER_CACHE_ENABLED = os.environ.get('USER_CACHE_ENABLED', 'true').lower() == 'true'
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '30'))
+USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', '2000'))
+
+# Reference data (users, projects, tasks) kept in memory as id -> document maps
+REFERENCE_CACHE_TTL_SECONDS = float(os.environ.get('REFERENCE_CACHE_TTL_SECONDS', '300'))
+# Writes bump a per-collection version in cache_versions; cached maps are checked against it at
+# most this often, which bounds how stale another worker's copy can be
+REFERENCE_CACHE_CHECK_SECONDS = float(os.environ.get('REFERENCE_CACHE_CHECK_SECONDS', '2'))
+
+# Notification delivery retries (background insert_many)
+NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', '3'))
+NOTIFICATION_RETRY_DELAY_SECONDS = float(os.environ.get('NOTIFICATION_RETRY_DELAY_SECONDS', '0.5'))
+
+# Per-user unread notification counters are periodically reconciled against the notifications
+NOTIFICATION_RECONCILE_INTERVAL_SECONDS = float(os.environ.get('NOTIFICATION_RECONCILE_INTERVAL_SECONDS', '3600'))
+UNREAD_RECONCILE_ID = "notification_counters:reconcile"
+
+# Timer heartbeats are coalesced in memory and flushed in bulk
+HEARTBEAT_FLUSH_INTERVAL_SECONDS = float(os.environ.get('HEARTBEAT_FLUSH_INTERVAL_SECONDS', '10'))
+
+# Timers whose last heartbeat is older than the grace window are stopped automatically.
+# The window must comfortably exceed the client heartbeat interval (30s) plus the flush interval.
+TIMER_STALE_AFTER_SECONDS = float(os.environ.get('TIMER_STALE_AFTER_SECONDS', '600'))
+TIMER_REAPER_INTERVAL_SECONDS = float(os.environ.get('TIMER_REAPER_INTERVAL_SECONDS', '60'))
+TIMER_REAPER_BATCH_SIZE = int(os.environ.get('TIMER_REAPER_BATCH_SIZE', '500'))
+
+# Server-Sent Events notification stream
+SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_QUEUE_SIZE = int(os.environ.get('SSE_QUEUE_SIZE', '100'))
+SSE_REPLAY_LIMIT = int(os.environ.get('SSE_REPLAY_LIMIT', '100'))
+# Streams also re-read the notifications collection on every heartbeat so notifications created
+# on other workers arrive; the overlap absorbs clock skew and late inserts between workers
+SSE_CATCHUP_OVERLAP_SECONDS = float(os.environ.get('SSE_CATCHUP_OVERLAP_SECONDS', '60'))
+# EventSource cannot send headers, so streams authenticate with a short-lived ticket in the URL
+SSE_TICKET_EXPIRE_SECONDS = int(os.environ.get('SSE_TICKET_EXPIRE_SECONDS', '60'))
+SSE_TICKET_SCOPE = "notification_stream"
+
+# Keyset pagination for list endpoints
+DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', '1000'))
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '1000'))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Read-heavy list endpoints encode their (already projected) documents straight to JSON with orjson
+FAST_LIST_RESPONSES = os.environ.get('FAST_LIST_RESPONSES', 'true').lower() == 'true'
+
+# Bulk time entry import
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '1000'))
+IMPORT_MAX_REPORTED_ERRORS = int(os.environ.get('IMPORT_MAX_REPORTED_ERRORS', '1000'))
+
+# Upper bound on timesheets per bulk review request
+BULK_REVIEW_MAX_ITEMS = int(os.environ.get('BULK_REVIEW_MAX_ITEMS', '1000'))
+
+# One-time daily_rollups backfill from existing time entries, retried until a worker completes it
+ROLLUP_BACKFILL_RETRY_SECONDS = float(os.environ.get('ROLLUP_BACKFILL_RETRY_SECONDS', '60'))
+ROLLUP_BACKFILL_LEASE_SECONDS = float(os.environ.get('ROLLUP_BACKFILL_LEASE_SECONDS', '3600'))
+ROLLUP_BACKFILL_ID = "daily_rollups:backfill"
+# Rebuilds re-aggregate rows that live writes touched meanwhile, a few passes at most
+ROLLUP_REBUILD_ID = "daily_rollups:rebuild"
+ROLLUP_REPAIR_PASSES = int(os.environ.get('ROLLUP_REPAIR_PASSES', '5'))
+ROLLUP_REPAIR_BATCH_SIZE = 500
+
+# Dashboard stats are cached briefly per user (one shared entry for admins)
+DASHBOARD_CACHE_TTL_SECONDS = float(os.environ.get('DASHBOARD_CACHE_TTL_SECONDS', '15'))
+ADMIN_DASHBOARD_KEY = "admin"
+
+# Report exports
+CSV_EXPORT_BATCH_SIZE = int(os.environ.get('CSV_EXPORT_BATCH_SIZE', '1000'))
+CSV_EXPORT_CHUNK_SIZE = 64 * 1024  # bytes buffered before a chunk is sent
+PDF_EXPORT_WORKERS = int(os.environ.get('PDF_EXPORT_WORKERS', '2'))
+PDF_EXPORT_MAX_QUEUE = int(os.environ.get('PDF_EXPORT_MAX_QUEUE', '20'))
+PDF_EXPORT_MAX_ROWS = int(os.environ.get('PDF_EXPORT_MAX_ROWS', '10000'))  # totals still cover every entry
+EXPORT_ENTRY_PROJECTION = {"_id": 0, "date": 1, "user_id": 1, "project_id": 1, "task_id": 1, "duration": 1}
+
 # Security
 security = HTTPBearer()
 
+# Identifies this process as the holder of background job leases. Assigned at startup, not
+# import, so workers forked from a preloaded app each get their own.
+worker_id: Optional[str] = None
+
+def assign_worker_id():
+    global worker_id
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
 # Create the main app
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
@@ -168,6 +672,12 @@ class TimerStartRequest(BaseModel):
 class TimerStopRequest(BaseModel):
     notes: Optional[str] = None
 
+class TimesheetBreakdownItem(BaseModel):
+    date: str  # YYYY-MM-DD
+    project_id: str
+    project_name: str
+    hours: float
+
 class Timesheet(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -175,6 +685,7 @@ class Timesheet(BaseModel):
     week_start: str  # YYYY-MM-DD
     week_end: str  # YYYY-MM-DD
     total_hours: float
+    breakdown: List[TimesheetBreakdownItem] = []  # snapshot taken at submit time
     status: TimesheetStatus
     submitted_at: Optional[datetime] = None
     reviewed_at: Optional[datetime] = None
@@ -190,6 +701,11 @@ class TimesheetReview(BaseModel):
     status: TimesheetStatus
     admin_comment: Optional[str] = None
 
+class TimesheetBulkReview(BaseModel):
+    timesheet_ids: List[str]
+    status: TimesheetStatus
+    admin_comment: Optional[str] = None
+
 class NotificationType(str, Enum):
     TIMESHEET_SUBMITTED = "timesheet_submitted"
     TIMESHEET_APPROVED = "timesheet_approved"
@@ -207,38 +723,518 @@ class Notification(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+# Serialization: timestamps are stored as native BSON dates
+# Fields holding timestamps, per collection (used by the datetime migration)
+DATETIME_FIELDS = {
+    "users": ("created_at",),
+    "projects": ("created_at",),
+    "tasks": ("created_at",),
+    "time_entries": ("start_time", "end_time", "created_at"),
+    "timer_sessions": ("start_time", "last_heartbeat", "stopped_at"),
+    "timesheets": ("submitted_at", "reviewed_at", "created_at"),
+    "notifications": ("created_at",),
+}
+
+def to_document(model: BaseModel) -> dict:
+    """Model -> MongoDB document, keeping datetimes native so they are stored as BSON dates"""
+    return model.model_dump()
+
+def as_datetime(value) -> datetime:
+    """Timezone-aware datetime from a BSON date or a legacy ISO string"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
 # Utility functions
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    return await password_executor.run(pwd_context.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_executor.run(pwd_context.verify, plain_password, hashed_password)
 
-def create_access_token(data: dict) -> str:
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def create_notification(user_id: str, notification_type: NotificationType, title: str, message: str, related_timesheet_id: Optional[str] = None):
-    """Helper function to create a notification"""
-    notification = Notification(
-        user_id=user_id,
-        type=notification_type,
-        title=title,
-        message=message,
-        related_timesheet_id=related_timesheet_id
+class BoundedExecutor:
+    """Runs blocking callables off the event loop with a fixed number of workers and a capped wait queue"""
+    
+    def __init__(self, executor_class, max_workers: int, max_queue: int, busy_detail: str, **executor_options):
+        self.executor_class = executor_class
+        self.executor_options = executor_options
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.busy_detail = busy_detail
+        self.running = 0
+        self.queued = 0
+        self.rejected = 0
+        self._executor = None
+        self._slots = asyncio.Semaphore(max_workers)
+    
+    async def run(self, fn, *args):
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail=self.busy_detail)
+        
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        
+        self.running += 1
+        try:
+            if self._executor is None:
+                self._executor = self.executor_class(max_workers=self.max_workers, **self.executor_options)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.running -= 1
+            self._slots.release()
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected
+        }
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire a fixed time after being set"""
+    
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+    
+    def get(self, key):
+        item = self._entries.get(key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return item[1]
+    
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+user_cache = TTLCache(ttl_seconds=USER_CACHE_TTL_SECONDS, max_size=USER_CACHE_MAX_SIZE)
+
+class ReferenceCache:
+    """Whole-collection id -> document maps, reloaded when another write bumped the collection's
+    version (checked every check_seconds) or once the TTL passes"""
+    
+    PROJECTIONS = {
+        "users": {"_id": 0, "password": 0},
+        "projects": {"_id": 0},
+        "tasks": {"_id": 0},
+    }
+    
+    def __init__(self, ttl_seconds: float, check_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.check_seconds = check_seconds
+        self.hits = 0
+        self.loads = 0
+        self.version_checks = 0
+        # name -> [expires_at, mapping, version, next_check_at]
+        self._maps: Dict[str, list] = {}
+        self._locks = {name: asyncio.Lock() for name in self.PROJECTIONS}
+    
+    async def version(self, name: str) -> int:
+        doc = await db.cache_versions.find_one({"_id": name}, {"version": 1})
+        return doc['version'] if doc else 0
+    
+    async def fresh(self, name: str, item: Optional[list]) -> bool:
+        now = time.monotonic()
+        if item is None or item[0] <= now:
+            return False
+        if item[3] > now:
+            return True
+        self.version_checks += 1
+        if await self.version(name) != item[2]:
+            return False
+        item[3] = now + self.check_seconds
+        return True
+    
+    async def get(self, name: str) -> Dict[str, dict]:
+        item = self._maps.get(name)
+        if await self.fresh(name, item):
+            self.hits += 1
+            return item[1]
+        
+        # One reload per collection at a time; concurrent callers wait for it
+        async with self._locks[name]:
+            item = self._maps.get(name)
+            if await self.fresh(name, item):
+                self.hits += 1
+                return item[1]
+            
+            # Version first: a write landing during the load shows up as a newer version
+            version = await self.version(name)
+            docs = await db[name].find({}, self.PROJECTIONS[name]).to_list(None)
+            mapping = {doc['id']: doc for doc in docs}
+            now = time.monotonic()
+            self._maps[name] = [now + self.ttl_seconds, mapping, version, now + self.check_seconds]
+            self.loads += 1
+            return mapping
+    
+    def invalidate(self, name: str):
+        """Drop this worker's copy"""
+        self._maps.pop(name, None)
+    
+    async def changed(self, name: str):
+        """Record a write so every worker reloads the collection"""
+        self.invalidate(name)
+        await db.cache_versions.update_one({"_id": name}, {"$inc": {"version": 1}}, upsert=True)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "check_seconds": self.check_seconds,
+            "hits": self.hits,
+            "loads": self.loads,
+            "version_checks": self.version_checks,
+            "sizes": {name: len(item[1]) for name, item in self._maps.items()}
+        }
+
+reference_cache = ReferenceCache(
+    ttl_seconds=REFERENCE_CACHE_TTL_SECONDS,
+    check_seconds=REFERENCE_CACHE_CHECK_SECONDS
+)
+dashboard_cache = TTLCache(ttl_seconds=DASHBOARD_CACHE_TTL_SECONDS, max_size=USER_CACHE_MAX_SIZE)
+
+def invalidate_dashboard_stats(user_id: Optional[str] = None):
+    """Drop cached dashboard stats for the admins and, if given, one employee"""
+    dashboard_cache.invalidate(ADMIN_DASHBOARD_KEY)
+    if user_id:
+        dashboard_cache.invalidate(user_id)
+
+class NotificationSubscription:
+    """One open notification stream; overflowed is set when the client falls too far behind"""
+    
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+class NotificationBroker:
+    """In-process pub/sub fanning new notifications out to the user's open streams"""
+    
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.published = 0
+        self.dropped = 0
+        self._subscribers: Dict[str, set] = {}
+    
+    def subscribe(self, user_id: str) -> NotificationSubscription:
+        subscription = NotificationSubscription(self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+    
+    def unsubscribe(self, user_id: str, subscription: NotificationSubscription):
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[user_id]
+    
+    def publish(self, notifications: List[Notification]):
+        for notification in notifications:
+            for subscription in self._subscribers.get(notification.user_id, ()):
+                if subscription.overflowed:
+                    continue
+                try:
+                    subscription.queue.put_nowait(notification)
+                    self.published += 1
+                except asyncio.QueueFull:
+                    # Stop buffering; the stream closes and the client resumes from Last-Event-ID
+                    subscription.overflowed = True
+                    self.dropped += 1
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "users": len(self._subscribers),
+            "connections": sum(len(subs) for subs in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+notification_broker = NotificationBroker(queue_size=SSE_QUEUE_SIZE)
+
+class HeartbeatCoalescer:
+    """Keeps the latest heartbeat per user and writes them all with one unordered bulk_write"""
+    
+    def __init__(self):
+        self.received = 0
+        self.written = 0
+        self.flushes = 0
+        self._pending: Dict[str, datetime] = {}
+    
+    def record(self, user_id: str, at: datetime):
+        self._pending[user_id] = at
+        self.received += 1
+    
+    def discard(self, user_id: str):
+        self._pending.pop(user_id, None)
+    
+    async def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        
+        # $max so a late flush can never move a heartbeat backwards
+        try:
+            await db.timer_sessions.bulk_write([
+                UpdateOne(
+                    {"user_id": user_id, "is_active": True},
+                    {"$max": {"last_heartbeat": at}}
+                )
+                for user_id, at in pending.items()
+            ], ordered=False)
+        except PyMongoError as e:
+            logging.warning(f"Heartbeat flush failed, retrying next interval: {e}")
+            for user_id, at in pending.items():
+                self._pending.setdefault(user_id, at)
+            return
+        
+        self.written += len(pending)
+        self.flushes += 1
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "received": self.received,
+            "written": self.written,
+            "flushes": self.flushes
+        }
+
+heartbeat_coalescer = HeartbeatCoalescer()
+
+password_executor = BoundedExecutor(
+    ThreadPoolExecutor,
+    max_workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_MAX_QUEUE,
+    busy_detail="Server is busy. Please try again shortly."
+)
+
+# Workers start from a clean forkserver process: forking this one would copy pymongo, Motor
+# and bcrypt threads' locks in whatever state they happen to be
+pdf_executor = BoundedExecutor(
+    ProcessPoolExecutor,
+    max_workers=PDF_EXPORT_WORKERS,
+    max_queue=PDF_EXPORT_MAX_QUEUE,
+    busy_detail="Too many PDF exports in progress. Please try again shortly.",
+    mp_context=multiprocessing.get_context("forkserver")
+)
+
+def encode_cursor(doc: dict, sort_field: str) -> str:
+    """Opaque cursor pointing just past doc in (sort_field, id) descending order"""
+    value = doc[sort_field]
+    if isinstance(value, datetime):
+        value = {"$date": value.isoformat()}
+    raw = json.dumps([value, doc['id']], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(decoded, list):
+            raise ValueError("cursor must be a list")
+        value, last_id = decoded
+        if isinstance(value, dict):
+            if not isinstance(value["$date"], str):
+                raise ValueError("$date must be a string")
+            value = as_datetime(value["$date"])
+        # Cursors only ever hold a plain sort value and an id; anything else is crafted
+        if isinstance(value, bool) or not isinstance(value, (str, int, float, datetime)):
+            raise ValueError("unsupported cursor value")
+        if not isinstance(last_id, str):
+            raise ValueError("cursor id must be a string")
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, last_id
+
+async def fetch_page(collection, query: dict, sort_field: str, limit: int, cursor: Optional[str], projection: dict) -> tuple:
+    """One page of a (sort_field desc, id desc) keyset scan; returns (docs, next_cursor)"""
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {sort_field: {"$lt": value}},
+            {sort_field: value, "id": {"$lt": last_id}}
+        ]}]}
+    
+    docs = await collection.find(query, projection).sort(
+        [(sort_field, DESCENDING), ("id", DESCENDING)]
+    ).limit(limit + 1).to_list(limit + 1)
+    
+    next_cursor = encode_cursor(docs[limit - 1], sort_field) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+class TrustedJSONResponse(Response):
+    """JSON response for documents that already match the response model; skips Pydantic re-validation"""
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+def model_projection(model_class, **extra) -> dict:
+    """Projection returning exactly the model's fields, so documents can be sent as-is"""
+    return {"_id": 0, **{name: 1 for name in model_class.model_fields}, **extra}
+
+def paged_response(response: Response, items: List[dict], next_cursor: Optional[str]):
+    """Return one page of a list endpoint, via the fast path when enabled"""
+    if FAST_LIST_RESPONSES:
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return TrustedJSONResponse(items, headers=headers)
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+def paginate_list(docs, sort_field: str, limit: int, cursor: Optional[str]) -> tuple:
+    """Same keyset semantics as fetch_page, for in-memory lists sorted on a timestamp field"""
+    docs = sorted(docs, key=lambda d: (as_datetime(d[sort_field]), d['id']), reverse=True)
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        position = (as_datetime(value), last_id)
+        docs = [d for d in docs if (as_datetime(d[sort_field]), d['id']) < position]
+    
+    next_cursor = encode_cursor(docs[limit - 1], sort_field) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+async def insert_notifications(notifications: List[Notification]):
+    """Write a batch of notifications with one unordered insert_many, retrying transient failures"""
+    if not notifications:
+        return
+    
+    docs = []
+    for notification in notifications:
+        notification_doc = to_document(notification)
+        docs.append(notification_doc)
+    
+    for attempt in range(1, NOTIFICATION_MAX_ATTEMPTS + 1):
+        try:
+            await db.notifications.insert_many(docs, ordered=False)
+            break
+        except BulkWriteError as e:
+            # insert_many assigned _id on the first attempt, so documents that already
+            # made it in come back as duplicate key errors and count as delivered
+            if all(err.get('code') == 11000 for err in e.details.get('writeErrors', [])) and not e.details.get('writeConcernErrors'):
+                break
+            error = e
+        except PyMongoError as e:
+            error = e
+        
+        if attempt < NOTIFICATION_MAX_ATTEMPTS:
+            await asyncio.sleep(NOTIFICATION_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+    else:
+        logging.error(f"Failed to deliver {len(docs)} notifications after {NOTIFICATION_MAX_ATTEMPTS} attempts: {error}")
+        return
+    
+    notification_broker.publish(notifications)
+    await increment_unread_counters(Counter(n.user_id for n in notifications))
+
+async def increment_unread_counters(counts: Dict[str, int]):
+    """Apply per-user unread deltas (after the notifications were inserted); failures only cause
+    drift that reconciliation repairs"""
+    try:
+        existing = {
+            doc['user_id'] for doc in await db.notification_counters.find(
+                {"user_id": {"$in": list(counts)}}, {"_id": 0, "user_id": 1}
+            ).to_list(None)
+        }
+        operations = []
+        for user_id, delta in counts.items():
+            if user_id in existing:
+                operations.append(UpdateOne(
+                    {"user_id": user_id},
+                    {"$inc": {"unread": delta}, "$currentDate": {"updated_at": True}}
+                ))
+            else:
+                # No counter yet: seed it from the notifications, which already include this batch
+                unread = await db.notifications.count_documents({"user_id": user_id, "read": False})
+                operations.append(UpdateOne(
+                    {"user_id": user_id},
+                    {"$setOnInsert": {"unread": unread}, "$currentDate": {"updated_at": True}},
+                    upsert=True
+                ))
+        await db.notification_counters.bulk_write(operations, ordered=False)
+    except PyMongoError as e:
+        logging.warning(f"Failed to update unread counters: {e}")
+
+async def reconcile_unread_counters():
+    """Reset counters to the true number of unread notifications; one worker at a time via a lease"""
+    if not await acquire_lease("unread_reconcile", NOTIFICATION_RECONCILE_INTERVAL_SECONDS):
+        return
+    
+    # Counters written after the count started may hold deltas it did not see; they wait for the next run.
+    # Missing counters are left to the lazy seeding in get_unread_count and increment_unread_counters.
+    started_at = await database_now(UNREAD_RECONCILE_ID)
+    not_since_started = {"$or": [{"updated_at": {"$lt": started_at}}, {"updated_at": {"$exists": False}}]}
+    unread = await db.notifications.aggregate([
+        {"$match": {"read": False}},
+        {"$group": {"_id": "$user_id", "unread": {"$sum": 1}}}
+    ]).to_list(None)
+    
+    reset = {"$currentDate": {"updated_at": True}}
+    if unread:
+        await db.notification_counters.bulk_write([
+            UpdateOne(
+                {"user_id": row['_id'], **not_since_started},
+                {"$set": {"unread": row['unread']}, **reset}
+            )
+            for row in unread
+        ], ordered=False)
+    await db.notification_counters.update_many(
+        {"user_id": {"$nin": [row['_id'] for row in unread]}, "unread": {"$ne": 0}, **not_since_started},
+        {"$set": {"unread": 0}, **reset}
     )
-    notification_doc = notification.model_dump()
-    notification_doc['created_at'] = notification_doc['created_at'].isoformat()
-    await db.notifications.insert_one(notification_doc)
-    return notification
+
+def send_notifications(background_tasks: BackgroundTasks, notifications: List[Notification]):
+    """Deliver notifications after the response has been sent"""
+    if notifications:
+        background_tasks.add_task(insert_notifications, notifications)
 
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    return await authenticate_token(credentials.credentials)
+
+async def authenticate_token(token: str, scope: Optional[str] = None) -> User:
+    """Resolve a token to its user; scoped tokens (stream tickets) are only valid for their scope"""
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
@@ -247,12 +1243,19 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    if payload.get("scope") != scope:
+        raise HTTPException(status_code=401, detail="Invalid token")
     
-    user_doc = await db.users.find_one({"id": user_id}, {"_id": 0})
-    if user_doc is None:
-        raise HTTPException(status_code=401, detail="User not found")
+    user = user_cache.get(user_id) if USER_CACHE_ENABLED else None
+    if user is None:
+        user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+        if user_doc is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        
+        user = User(**user_doc)
+        if USER_CACHE_ENABLED:
+            user_cache.set(user_id, user)
     
-    user = User(**user_doc)
     if user.status == UserStatus.INACTIVE:
         raise HTTPException(status_code=403, detail="Account is inactive")
     
@@ -273,12 +1276,320 @@ async def init_default_admin():
             role=UserRole.ADMIN,
             status=UserStatus.ACTIVE
         )
-        admin_doc = admin_user.model_dump()
-        admin_doc['password'] = hash_password("admin123")
-        admin_doc['created_at'] = admin_doc['created_at'].isoformat()
+        admin_doc = to_document(admin_user)
+        admin_doc['password'] = await hash_password("admin123")
         await db.users.insert_one(admin_doc)
         logging.info("Default admin created: admin@omnigratum.com / admin123")
 
+# Indexes backing the hot query paths, keyed by collection
+INDEX_SPECS = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("role", ASCENDING), ("status", ASCENDING)], name="role_status"),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_id"),
+    ],
+    "time_entries": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("user_id", ASCENDING), ("date", ASCENDING)], name="user_date"),
+        IndexModel([("date", ASCENDING)], name="date"),
+        IndexModel(
+            [("user_id", ASCENDING), ("start_time", DESCENDING), ("id", DESCENDING)],
+            name="user_start_id",
+        ),
+        IndexModel([("start_time", DESCENDING), ("id", DESCENDING)], name="start_id"),
+        IndexModel(
+            [("user_id", ASCENDING), ("idempotency_key", ASCENDING)],
+            name="user_idempotency_key",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$exists": True}},
+        ),
+    ],
+    "timer_sessions": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("user_id", ASCENDING)],
+            name="one_active_timer_per_user",
+            unique=True,
+            partialFilterExpression={"is_active": True},
+        ),
+        IndexModel(
+            [("last_heartbeat", ASCENDING)],
+            name="active_last_heartbeat",
+            partialFilterExpression={"is_active": True},
+        ),
+        IndexModel(
+            [("stopped_at", ASCENDING)],
+            name="reaped_without_entry",
+            partialFilterExpression={"entry_written": False},
+        ),
+    ],
+    "timesheets": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("user_id", ASCENDING), ("week_start", ASCENDING), ("week_end", ASCENDING)], name="user_week"),
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="status_created_id",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="user_created_id",
+        ),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_id"),
+    ],
+    "notifications": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("user_id", ASCENDING), ("read", ASCENDING), ("created_at", DESCENDING)],
+            name="user_read_created",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="user_created_id",
+        ),
+    ],
+    "notification_counters": [
+        IndexModel([("user_id", ASCENDING)], name="user_unique", unique=True),
+    ],
+    "daily_rollups": [
+        IndexModel(
+            [("user_id", ASCENDING), ("date", ASCENDING), ("project_id", ASCENDING), ("task_id", ASCENDING)],
+            name="rollup_key_unique",
+            unique=True,
+        ),
+        IndexModel([("date", ASCENDING)], name="date"),
+    ],
+    "projects": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "tasks": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("project_id", ASCENDING)], name="project"),
+    ],
+}
+
+async def ensure_indexes():
+    """Create the declared indexes one by one so a single failure (e.g. duplicates) doesn't block the rest"""
+    for collection_name, models in INDEX_SPECS.items():
+        collection = db[collection_name]
+        for model in models:
+            try:
+                await collection.create_indexes([model])
+            except OperationFailure as e:
+                logging.error(f"Failed to create index {collection_name}.{model.document['name']}: {e}")
+
+async def check_indexes() -> Dict[str, Any]:
+    """Compare declared indexes with what the server has and report missing, undeclared and unused ones"""
+    report = {"missing": [], "undeclared": [], "unused": []}
+    for collection_name, models in INDEX_SPECS.items():
+        collection = db[collection_name]
+        declared = {model.document['name'] for model in models}
+        existing = set((await collection.index_information()).keys()) - {"_id_"}
+        
+        report["missing"].extend(f"{collection_name}.{name}" for name in sorted(declared - existing))
+        report["undeclared"].extend(f"{collection_name}.{name}" for name in sorted(existing - declared))
+        
+        try:
+            stats = await collection.aggregate([{"$indexStats": {}}]).to_list(None)
+        except OperationFailure as e:
+            logging.warning(f"Cannot read $indexStats for {collection_name}: {e}")
+            continue
+        for stat in stats:
+            if stat['name'] != "_id_" and stat.get('accesses', {}).get('ops', 0) == 0:
+                report["unused"].append(f"{collection_name}.{stat['name']}")
+    
+    if report["missing"]:
+        logging.error(f"Missing indexes: {', '.join(report['missing'])}")
+    if report["undeclared"]:
+        logging.warning(f"Undeclared indexes: {', '.join(report['undeclared'])}")
+    if report["unused"]:
+        logging.info(f"Indexes with no recorded use: {', '.join(report['unused'])}")
+    return report
+
+def datetime_migration_id(collection_name: str) -> str:
+    return f"datetimes:{collection_name}"
+
+async def check_datetime_migration() -> List[str]:
+    """Report collections that still hold ISO-string timestamps; keyset pagination skips them past the type boundary"""
+    pending = []
+    for collection_name, fields in DATETIME_FIELDS.items():
+        marker_id = datetime_migration_id(collection_name)
+        if await db.migrations.find_one({"_id": marker_id, "done": True}, {"_id": 1}):
+            continue
+        legacy = await db[collection_name].find_one(
+            {"$or": [{field: {"$type": "string"}} for field in fields]}, {"_id": 1}
+        )
+        if legacy:
+            pending.append(collection_name)
+        else:
+            # Nothing to convert (e.g. a fresh install): record it so later startups skip the scan
+            await db.migrations.update_one({"_id": marker_id}, {"$set": {"done": True}}, upsert=True)
+
+    if pending:
+        logging.error(
+            f"Collections with ISO-string timestamps: {', '.join(pending)}. "
+            "Lists and cursors sorted on those fields are incomplete until "
+            "`python manage.py migrate-datetimes` has run"
+        )
+    return pending
+
+# Daily rollups: summed duration and entry count per (user, project, task, date)
+ROLLUP_KEY_FIELDS = ("user_id", "date", "project_id", "task_id")
+
+async def apply_rollup_deltas(entry_docs: List[dict], sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) entries from the rollups; drift is repaired by rebuild_daily_rollups"""
+    deltas: Dict[tuple, List[int]] = {}
+    for entry_doc in entry_docs:
+        key = tuple(entry_doc[field] for field in ROLLUP_KEY_FIELDS)
+        delta = deltas.setdefault(key, [0, 0])
+        delta[0] += entry_doc.get('duration', 0)
+        delta[1] += 1
+    if not deltas:
+        return
+    
+    for user_id in {key[0] for key in deltas}:
+        invalidate_dashboard_stats(user_id)
+    
+    # updated_at (database clock) and revision let a running rebuild find and re-check these rows
+    try:
+        await db.daily_rollups.bulk_write([
+            UpdateOne(
+                dict(zip(ROLLUP_KEY_FIELDS, key)),
+                {
+                    "$inc": {"duration": sign * duration, "entry_count": sign * count, "revision": 1},
+                    "$currentDate": {"updated_at": True}
+                },
+                upsert=True
+            )
+            for key, (duration, count) in deltas.items()
+        ], ordered=False)
+    except PyMongoError as e:
+        logging.error(f"Failed to update daily rollups, run `python manage.py rebuild-rollups`: {e}")
+
+async def database_now(marker_id: str) -> datetime:
+    """Current time on the database clock (the one $currentDate stamps), recorded on a migrations marker"""
+    doc = await db.migrations.find_one_and_update(
+        {"_id": marker_id},
+        {"$currentDate": {"checked_at": True}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return as_datetime(doc['checked_at'])
+
+def rollup_group_stage() -> dict:
+    return {"$group": {
+        "_id": {field: f"${field}" for field in ROLLUP_KEY_FIELDS},
+        "duration": {"$sum": {"$ifNull": ["$duration", 0]}},
+        "entry_count": {"$sum": 1}
+    }}
+
+async def rebuild_daily_rollups(start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """Recompute rollups from time_entries in place, for all dates or an inclusive YYYY-MM-DD range"""
+    date_range = {}
+    if start_date:
+        date_range["$gte"] = start_date
+    if end_date:
+        date_range["$lte"] = end_date
+    match = {"date": date_range} if date_range else {}
+    
+    # Rows stay readable throughout: the merge overwrites counts but keeps updated_at and revision,
+    # and rows a live write touched since started_at are re-aggregated afterwards
+    started_at = await database_now(ROLLUP_REBUILD_ID)
+    rebuild_id = uuid.uuid4().hex
+    await db.time_entries.aggregate([
+        {"$match": match},
+        rollup_group_stage(),
+        {"$replaceWith": {"$mergeObjects": [
+            "$_id", {"duration": "$duration", "entry_count": "$entry_count", "rebuild_id": rebuild_id}
+        ]}},
+        {"$merge": {
+            "into": "daily_rollups",
+            "on": list(ROLLUP_KEY_FIELDS),
+            "whenMatched": [{"$set": {
+                "duration": "$$new.duration",
+                "entry_count": "$$new.entry_count",
+                "rebuild_id": "$$new.rebuild_id"
+            }}],
+            "whenNotMatched": "insert"
+        }}
+    ]).to_list(None)
+    
+    # Rows the scan did not produce have no entries left
+    await db.daily_rollups.delete_many({
+        **match,
+        "rebuild_id": {"$ne": rebuild_id},
+        "$or": [{"updated_at": {"$lt": started_at}}, {"updated_at": {"$exists": False}}]
+    })
+    await repair_touched_rollups(match, started_at)
+
+async def repair_touched_rollups(match: dict, since: datetime):
+    """Re-aggregate rollup rows written since `since`, whose deltas a rebuild may have overwritten"""
+    for _ in range(ROLLUP_REPAIR_PASSES):
+        pass_started_at = await database_now(ROLLUP_REBUILD_ID)
+        touched = await db.daily_rollups.find(
+            {**match, "updated_at": {"$gte": since}},
+            {"_id": 0, "revision": 1, **{field: 1 for field in ROLLUP_KEY_FIELDS}}
+        ).to_list(None)
+        if not touched:
+            return
+        
+        for start in range(0, len(touched), ROLLUP_REPAIR_BATCH_SIZE):
+            batch = touched[start:start + ROLLUP_REPAIR_BATCH_SIZE]
+            keys = [{field: row[field] for field in ROLLUP_KEY_FIELDS} for row in batch]
+            grouped = await db.time_entries.aggregate([
+                {"$match": {"$or": keys}},
+                rollup_group_stage()
+            ]).to_list(None)
+            totals = {tuple(g['_id'][field] for field in ROLLUP_KEY_FIELDS): g for g in grouped}
+            
+            # A row written again since it was read keeps its value and is picked up by the next pass
+            operations = []
+            for row, key in zip(batch, keys):
+                total = totals.get(tuple(key.values()), {})
+                operations.append(UpdateOne(
+                    {**key, "revision": row.get('revision')},
+                    {"$set": {"duration": total.get('duration', 0), "entry_count": total.get('entry_count', 0)}}
+                ))
+            await db.daily_rollups.bulk_write(operations, ordered=False)
+        since = pass_started_at
+    
+    logging.warning("daily_rollups still changing after the rebuild, run `python manage.py rebuild-rollups` again")
+
+# Until the backfill marker exists, rollup readers aggregate time_entries directly. Both
+# collections share the rollup key fields; a time entry counts as one entry.
+rollups_backfilled = False
+
+async def rollups_ready() -> bool:
+    global rollups_backfilled
+    if not rollups_backfilled and await db.migrations.find_one({"_id": ROLLUP_BACKFILL_ID, "done": True}, {"_id": 1}):
+        rollups_backfilled = True
+    return rollups_backfilled
+
+async def rollup_source(database=None):
+    """daily_rollups once backfilled, otherwise time_entries"""
+    database = database if database is not None else db
+    return database.daily_rollups if await rollups_ready() else database.time_entries
+
+async def mark_rollups_backfilled():
+    global rollups_backfilled
+    await db.migrations.update_one(
+        {"_id": ROLLUP_BACKFILL_ID},
+        {"$set": {"done": True, "completed_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+    rollups_backfilled = True
+
+async def backfill_daily_rollups():
+    """Build daily_rollups from all existing time entries once; one worker at a time via a lease"""
+    if await rollups_ready():
+        return
+    if not await acquire_lease("rollup_backfill", ROLLUP_BACKFILL_LEASE_SECONDS):
+        return
+    logging.info("Backfilling daily_rollups from time_entries")
+    await rebuild_daily_rollups()
+    await mark_rollups_backfilled()
+    logging.info("daily_rollups backfill complete")
+
 # Auth routes
 @api_router.post("/auth/login", response_model=LoginResponse)
 async def login(request: LoginRequest):
@@ -286,7 +1597,7 @@ async def login(request: LoginRequest):
     if not user_doc:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    if not verify_password(request.password, user_doc.get('password', '')):
+    if not await verify_password(request.password, user_doc.get('password', '')):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     user = User(**user_doc)
@@ -302,18 +1613,11 @@ async def get_me(current_user: User = Depends(get_current_user)):
 
 # Timer routes
 @api_router.post("/timer/start")
-async def start_timer(request: TimerStartRequest, current_user: User = Depends(get_current_user)):
-    today = datetime.now(timezone.utc).date().isoformat()
-    
-    # Check for existing active timer
-    existing_timer = await db.timer_sessions.find_one(
-        {"user_id": current_user.id, "is_active": True},
-        {"_id": 0}
-    )
-    if existing_timer:
-        raise HTTPException(status_code=400, detail="Timer already running. Stop current timer first.")
-    
-    # Create new timer session
+async def start_timer(
+    request: TimerStartRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: User = Depends(get_current_user)
+):
     now = datetime.now(timezone.utc)
     timer = TimerSession(
         user_id=current_user.id,
@@ -322,49 +1626,83 @@ async def start_timer(request: TimerStartRequest, current_user: User = Depends(g
         start_time=now,
         last_heartbeat=now,
         is_active=True,
-        date=today
+        date=now.date().isoformat()
     )
     
-    timer_doc = timer.model_dump()
-    timer_doc['start_time'] = timer_doc['start_time'].isoformat()
-    timer_doc['last_heartbeat'] = timer_doc['last_heartbeat'].isoformat()
-    await db.timer_sessions.insert_one(timer_doc)
+    timer_doc = to_document(timer)
+    if idempotency_key:
+        timer_doc['idempotency_key'] = idempotency_key
+    
+    # The one_active_timer_per_user partial unique index rejects a second active timer
+    try:
+        await db.timer_sessions.insert_one(timer_doc)
+    except DuplicateKeyError:
+        if idempotency_key:
+            existing = await db.timer_sessions.find_one(
+                {"user_id": current_user.id, "is_active": True, "idempotency_key": idempotency_key},
+                {"_id": 0}
+            )
+            if existing:
+                return {"success": True, "timer": TimerSession(**existing)}
+        raise HTTPException(status_code=400, detail="Timer already running. Stop current timer first.")
     
+    invalidate_dashboard_stats()
     return {"success": True, "timer": timer}
 
 @api_router.post("/timer/heartbeat")
 async def timer_heartbeat(current_user: User = Depends(get_current_user)):
-    timer_doc = await db.timer_sessions.find_one(
-        {"user_id": current_user.id, "is_active": True},
-        {"_id": 0}
-    )
-    if not timer_doc:
-        raise HTTPException(status_code=404, detail="No active timer found")
-    
+    # Written on the next flush; a heartbeat without an active timer matches nothing there
     now = datetime.now(timezone.utc)
-    await db.timer_sessions.update_one(
-        {"id": timer_doc['id']},
-        {"$set": {"last_heartbeat": now.isoformat()}}
-    )
+    heartbeat_coalescer.record(current_user.id, now)
     
     return {"success": True, "last_heartbeat": now}
 
+async def find_idempotent_entry(user_id: str, idempotency_key: str) -> Optional[dict]:
+    return await db.time_entries.find_one(
+        {"user_id": user_id, "idempotency_key": idempotency_key},
+        {"_id": 0}
+    )
+
 @api_router.post("/timer/stop")
-async def stop_timer(request: TimerStopRequest, current_user: User = Depends(get_current_user)):
-    timer_doc = await db.timer_sessions.find_one(
+async def stop_timer(
+    request: TimerStopRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: User = Depends(get_current_user)
+):
+    # A retried stop gets back the entry its first attempt created, before it can touch
+    # a timer the user has started since
+    if idempotency_key:
+        entry_doc = await find_idempotent_entry(current_user.id, idempotency_key)
+        if entry_doc:
+            return {"success": True, "time_entry": TimeEntry(**entry_doc)}
+    
+    end_time = datetime.now(timezone.utc)
+    entry_id = str(uuid.uuid4())
+    
+    # Atomically claim the active session; concurrent stops cannot both get it
+    timer_doc = await db.timer_sessions.find_one_and_update(
         {"user_id": current_user.id, "is_active": True},
-        {"_id": 0}
+        {"$set": {"is_active": False, "stopped_at": end_time, "time_entry_id": entry_id}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
     )
+    heartbeat_coalescer.discard(current_user.id)
+    
     if not timer_doc:
+        # A concurrent retry of this stop may have just created the entry
+        if idempotency_key:
+            entry_doc = await find_idempotent_entry(current_user.id, idempotency_key)
+            if entry_doc:
+                return {"success": True, "time_entry": TimeEntry(**entry_doc)}
         raise HTTPException(status_code=404, detail="No active timer found")
     
     # Calculate duration
-    start_time = datetime.fromisoformat(timer_doc['start_time'])
-    end_time = datetime.now(timezone.utc)
+    start_time = as_datetime(timer_doc['start_time'])
     duration = int((end_time - start_time).total_seconds())
     
     # Create time entry
     time_entry = TimeEntry(
+        id=entry_id,
         user_id=current_user.id,
         project_id=timer_doc['project_id'],
         task_id=timer_doc['task_id'],
@@ -376,17 +1714,25 @@ async def stop_timer(request: TimerStopRequest, current_user: User = Depends(get
         notes=request.notes
     )
     
-    entry_doc = time_entry.model_dump()
-    entry_doc['start_time'] = entry_doc['start_time'].isoformat()
-    entry_doc['end_time'] = entry_doc['end_time'].isoformat()
-    entry_doc['created_at'] = entry_doc['created_at'].isoformat()
-    await db.time_entries.insert_one(entry_doc)
+    entry_doc = to_document(time_entry)
+    if idempotency_key:
+        entry_doc['idempotency_key'] = idempotency_key
     
-    # Deactivate timer
-    await db.timer_sessions.update_one(
-        {"id": timer_doc['id']},
-        {"$set": {"is_active": False}}
-    )
+    try:
+        await db.time_entries.insert_one(entry_doc)
+    except PyMongoError as e:
+        # Hand the session back so the user can retry the stop
+        await db.timer_sessions.update_one(
+            {"id": timer_doc['id'], "time_entry_id": entry_id},
+            {"$set": {"is_active": True}, "$unset": {"stopped_at": "", "time_entry_id": ""}}
+        )
+        if isinstance(e, DuplicateKeyError) and idempotency_key:
+            # A concurrent attempt with the same key already stored its entry
+            existing = await find_idempotent_entry(current_user.id, idempotency_key)
+            if existing:
+                return {"success": True, "time_entry": TimeEntry(**existing)}
+        raise
+    await apply_rollup_deltas([entry_doc])
     
     return {"success": True, "time_entry": time_entry}
 
@@ -399,12 +1745,6 @@ async def get_active_timer(current_user: User = Depends(get_current_user)):
     if not timer_doc:
         return {"active": False, "timer": None}
     
-    # Parse datetime
-    if isinstance(timer_doc['start_time'], str):
-        timer_doc['start_time'] = datetime.fromisoformat(timer_doc['start_time'])
-    if isinstance(timer_doc['last_heartbeat'], str):
-        timer_doc['last_heartbeat'] = datetime.fromisoformat(timer_doc['last_heartbeat'])
-    
     timer = TimerSession(**timer_doc)
     return {"active": True, "timer": timer}
 
@@ -414,6 +1754,9 @@ async def get_time_entries(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     user_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    response: Response = None,
     current_user: User = Depends(get_current_user)
 ):
     query = {}
@@ -431,18 +1774,10 @@ async def get_time_entries(
     elif end_date:
         query['date'] = {"$lte": end_date}
     
-    entries = await db.time_entries.find(query, {"_id": 0}).sort("start_time", -1).to_list(1000)
-    
-    # Parse datetime strings
-    for entry in entries:
-        if isinstance(entry['start_time'], str):
-            entry['start_time'] = datetime.fromisoformat(entry['start_time'])
-        if entry.get('end_time') and isinstance(entry['end_time'], str):
-            entry['end_time'] = datetime.fromisoformat(entry['end_time'])
-        if isinstance(entry['created_at'], str):
-            entry['created_at'] = datetime.fromisoformat(entry['created_at'])
-    
-    return entries
+    entries, next_cursor = await fetch_page(
+        db.time_entries, query, "start_time", limit, cursor, model_projection(TimeEntry)
+    )
+    return paged_response(response, entries, next_cursor)
 
 @api_router.post("/time-entries/manual", response_model=TimeEntry)
 async def create_manual_entry(entry: TimeEntryCreate, current_user: User = Depends(get_current_user)):
@@ -467,11 +1802,9 @@ async def create_manual_entry(entry: TimeEntryCreate, current_user: User = Depen
         notes=entry.notes
     )
     
-    entry_doc = time_entry.model_dump()
-    entry_doc['start_time'] = entry_doc['start_time'].isoformat()
-    entry_doc['end_time'] = entry_doc['end_time'].isoformat()
-    entry_doc['created_at'] = entry_doc['created_at'].isoformat()
+    entry_doc = to_document(time_entry)
     await db.time_entries.insert_one(entry_doc)
+    await apply_rollup_deltas([entry_doc])
     
     return time_entry
 
@@ -485,12 +1818,170 @@ async def delete_time_entry(entry_id: str, current_user: User = Depends(get_curr
     if entry['user_id'] != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    await db.time_entries.delete_one({"id": entry_id})
+    result = await db.time_entries.delete_one({"id": entry_id})
+    if result.deleted_count:
+        await apply_rollup_deltas([entry], sign=-1)
     return {"success": True}
 
+IMPORT_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+def import_text(row: dict, field: str) -> str:
+    """A text column of an import row; missing or empty is "", anything other than a string is an error"""
+    value = row.get(field)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be a string")
+    return value
+
+class ImportResolver:
+    """Maps the user/project/task columns of an import row to ids, from one preload of the reference data"""
+    
+    def __init__(self, users: Dict[str, dict], projects: Dict[str, dict], tasks: Dict[str, dict]):
+        self.users = users
+        self.projects = projects
+        self.tasks = tasks
+        self.users_by_email = {u['email'].lower(): u['id'] for u in users.values()}
+        self.projects_by_name = {p['name'].lower(): p['id'] for p in projects.values()}
+        self.tasks_by_name = {(t['project_id'], t['name'].lower()): t['id'] for t in tasks.values()}
+    
+    def resolve(self, row: dict) -> tuple:
+        user_id = import_text(row, 'user_id') or self.users_by_email.get(import_text(row, 'user_email').lower())
+        if user_id not in self.users:
+            raise ValueError("unknown user")
+        
+        project_id = import_text(row, 'project_id') or self.projects_by_name.get(import_text(row, 'project').lower())
+        if project_id not in self.projects:
+            raise ValueError("unknown project")
+        
+        task_id = import_text(row, 'task_id') or self.tasks_by_name.get((project_id, import_text(row, 'task').lower()))
+        if task_id not in self.tasks or self.tasks[task_id]['project_id'] != project_id:
+            raise ValueError("unknown task for this project")
+        
+        return user_id, project_id, task_id
+
+def build_import_entry(row: dict, resolver: ImportResolver) -> dict:
+    """Validate one import row and return the time entry document to insert"""
+    user_id, project_id, task_id = resolver.resolve(row)
+    
+    for field in ('start_time', 'end_time'):
+        if not import_text(row, field):
+            raise ValueError(f"{field} must be an ISO 8601 timestamp")
+    start_time = as_datetime(row['start_time'])
+    end_time = as_datetime(row['end_time'])
+    if end_time < start_time:
+        raise ValueError("end_time is before start_time")
+    duration = row.get('duration')
+    if isinstance(duration, bool):
+        raise ValueError("duration must be a number of seconds")
+    duration = int(duration) if duration not in (None, '') else int((end_time - start_time).total_seconds())
+    if duration < 0:
+        raise ValueError("duration must not be negative")
+    
+    entry_date = import_text(row, 'date') or start_time.date().isoformat()
+    if not IMPORT_DATE_PATTERN.match(entry_date):
+        raise ValueError("date must be YYYY-MM-DD")
+    datetime.strptime(entry_date, "%Y-%m-%d")  # rejects impossible dates such as 2025-02-30
+    
+    time_entry = TimeEntry(
+        user_id=user_id,
+        project_id=project_id,
+        task_id=task_id,
+        start_time=start_time,
+        end_time=end_time,
+        duration=duration,
+        entry_type=import_text(row, 'entry_type') or EntryType.MANUAL,
+        date=entry_date,
+        notes=import_text(row, 'notes') or None
+    )
+    return to_document(time_entry)
+
+def iter_import_rows(upload: UploadFile, file_format: str):
+    """Yield (row number, row dict) from a CSV (with header) or NDJSON upload"""
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if line.strip():
+                yield line_number, line
+
+async def insert_import_batch(batch: List[tuple], result: dict):
+    """Insert one validated batch unordered; rows the database rejects are reported, the rest kept"""
+    if not batch:
+        return
+    docs = [doc for _, doc in batch]
+    failed = {}
+    try:
+        await db.time_entries.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        failed = {err['index']: err.get('errmsg', 'write failed') for err in e.details.get('writeErrors', [])}
+    
+    for index, error in failed.items():
+        record_import_error(result, batch[index][0], error)
+    inserted = [doc for index, doc in enumerate(docs) if index not in failed]
+    result['inserted'] += len(inserted)
+    await apply_rollup_deltas(inserted)
+
+def record_import_error(result: dict, row_number: int, error: str):
+    result['failed'] += 1
+    if len(result['errors']) < IMPORT_MAX_REPORTED_ERRORS:
+        result['errors'].append({"row": row_number, "error": error})
+    else:
+        result['errors_truncated'] = True
+
+@api_router.post("/admin/time-entries/import")
+async def import_time_entries(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one JSON object per line)"),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Bulk-load time entries; invalid rows are reported individually and do not abort the import"""
+    if file_format is None:
+        file_format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    
+    # Fresh reference data, so users, projects and tasks created on other workers resolve
+    for name in ("users", "projects", "tasks"):
+        reference_cache.invalidate(name)
+    resolver = ImportResolver(
+        await reference_cache.get("users"),
+        await reference_cache.get("projects"),
+        await reference_cache.get("tasks")
+    )
+    result = {"inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    batch = []
+    row_number = 0
+    
+    try:
+        for row_number, row in iter_import_rows(file, file_format):
+            try:
+                if file_format == "ndjson":
+                    row = json.loads(row)
+                    if not isinstance(row, dict):
+                        raise ValueError("expected a JSON object")
+                batch.append((row_number, build_import_entry(row, resolver)))
+            except (ValueError, TypeError, AttributeError, ValidationError) as e:
+                record_import_error(result, row_number, str(e).splitlines()[0])
+            
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await insert_import_batch(batch, result)
+                batch = []
+    except (UnicodeDecodeError, csv.Error) as e:
+        # The rest of the file cannot be read; keep what was parsed so far
+        record_import_error(result, row_number + 1, f"unreadable file from here on: {e}")
+    
+    await insert_import_batch(batch, result)
+    return result
+
 # Timesheets routes
 @api_router.post("/timesheets/submit")
-async def submit_timesheet(request: TimesheetSubmit, current_user: User = Depends(get_current_user)):
+async def submit_timesheet(
+    request: TimesheetSubmit,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
     # Check if already submitted
     existing = await db.timesheets.find_one({
         "user_id": current_user.id,
@@ -501,14 +1992,32 @@ async def submit_timesheet(request: TimesheetSubmit, current_user: User = Depend
     if existing and existing.get('status') in [TimesheetStatus.SUBMITTED.value, TimesheetStatus.APPROVED.value]:
         raise HTTPException(status_code=400, detail="Timesheet already submitted for this period")
     
-    # Calculate total hours
-    entries = await db.time_entries.find({
-        "user_id": current_user.id,
-        "date": {"$gte": request.week_start, "$lte": request.week_end}
-    }, {"_id": 0}).to_list(1000)
-    
-    total_seconds = sum(entry.get('duration', 0) for entry in entries)
-    total_hours = round(total_seconds / 3600, 2)
+    # Snapshot the week as day x project totals; the timesheet total is their sum
+    source = await rollup_source()
+    rows = await source.aggregate([
+        {"$match": {
+            "user_id": current_user.id,
+            "date": {"$gte": request.week_start, "$lte": request.week_end}
+        }},
+        {"$group": {
+            "_id": {"date": "$date", "project_id": "$project_id"},
+            "duration": {"$sum": {"$ifNull": ["$duration", 0]}}
+        }},
+        {"$match": {"duration": {"$gt": 0}}},
+        {"$sort": {"_id.date": 1, "_id.project_id": 1}}
+    ]).to_list(None)
+    
+    projects = await reference_cache.get("projects")
+    breakdown = [
+        TimesheetBreakdownItem(
+            date=row['_id']['date'],
+            project_id=row['_id']['project_id'],
+            project_name=projects.get(row['_id']['project_id'], {}).get('name', 'Unknown'),
+            hours=round(row['duration'] / 3600, 2)
+        )
+        for row in rows
+    ]
+    total_hours = round(sum(row['duration'] for row in rows) / 3600, 2)
     
     now = datetime.now(timezone.utc)
     
@@ -518,8 +2027,9 @@ async def submit_timesheet(request: TimesheetSubmit, current_user: User = Depend
             {"id": existing['id']},
             {"$set": {
                 "total_hours": total_hours,
+                "breakdown": [item.model_dump() for item in breakdown],
                 "status": TimesheetStatus.SUBMITTED.value,
-                "submitted_at": now.isoformat()
+                "submitted_at": now
             }}
         )
         timesheet_id = existing['id']
@@ -530,26 +2040,29 @@ async def submit_timesheet(request: TimesheetSubmit, current_user: User = Depend
             week_start=request.week_start,
             week_end=request.week_end,
             total_hours=total_hours,
+            breakdown=breakdown,
             status=TimesheetStatus.SUBMITTED,
             submitted_at=now
         )
         
-        timesheet_doc = timesheet.model_dump()
-        timesheet_doc['submitted_at'] = timesheet_doc['submitted_at'].isoformat()
-        timesheet_doc['created_at'] = timesheet_doc['created_at'].isoformat()
+        timesheet_doc = to_document(timesheet)
         await db.timesheets.insert_one(timesheet_doc)
         timesheet_id = timesheet.id
     
-    # Create notifications for all admins
-    admins = await db.users.find({"role": UserRole.ADMIN.value}, {"_id": 0}).to_list(1000)
-    for admin in admins:
-        await create_notification(
+    invalidate_dashboard_stats()
+    
+    # Notify all admins once the response is out
+    users = await reference_cache.get("users")
+    send_notifications(background_tasks, [
+        Notification(
             user_id=admin['id'],
-            notification_type=NotificationType.TIMESHEET_SUBMITTED,
+            type=NotificationType.TIMESHEET_SUBMITTED,
             title="New Timesheet Submission",
             message=f"{current_user.name} submitted a timesheet for {request.week_start}",
             related_timesheet_id=timesheet_id
         )
+        for admin in users.values() if admin.get('role') == UserRole.ADMIN.value
+    ])
     
     return {"success": True, "timesheet_id": timesheet_id}
 
@@ -557,6 +2070,9 @@ async def submit_timesheet(request: TimesheetSubmit, current_user: User = Depend
 async def get_timesheets(
     status: Optional[TimesheetStatus] = None,
     user_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    response: Response = None,
     current_user: User = Depends(get_current_user)
 ):
     query = {}
@@ -570,23 +2086,116 @@ async def get_timesheets(
     if status:
         query['status'] = status.value
     
-    timesheets = await db.timesheets.find(query, {"_id": 0}).sort("created_at", -1).to_list(1000)
+    timesheets, next_cursor = await fetch_page(
+        db.timesheets, query, "created_at", limit, cursor, model_projection(Timesheet)
+    )
+    return paged_response(response, timesheets, next_cursor)
+
+def review_notification(timesheet: dict, review: TimesheetReview) -> Notification:
+    """Notification telling the employee how their timesheet was reviewed"""
+    if review.status == TimesheetStatus.APPROVED:
+        notification_type = NotificationType.TIMESHEET_APPROVED
+        title = "Timesheet Approved"
+        message = f"Your timesheet for {timesheet['week_start']} has been approved"
+    else:
+        notification_type = NotificationType.TIMESHEET_DENIED
+        title = "Timesheet Denied"
+        message = f"Your timesheet for {timesheet['week_start']} has been denied"
+        if review.admin_comment:
+            message += f": {review.admin_comment}"
     
-    # Parse datetime strings
-    for ts in timesheets:
-        if ts.get('submitted_at') and isinstance(ts['submitted_at'], str):
-            ts['submitted_at'] = datetime.fromisoformat(ts['submitted_at'])
-        if ts.get('reviewed_at') and isinstance(ts['reviewed_at'], str):
-            ts['reviewed_at'] = datetime.fromisoformat(ts['reviewed_at'])
-        if isinstance(ts['created_at'], str):
-            ts['created_at'] = datetime.fromisoformat(ts['created_at'])
+    return Notification(
+        user_id=timesheet['user_id'],
+        type=notification_type,
+        title=title,
+        message=message,
+        related_timesheet_id=timesheet['id']
+    )
+
+def review_update(review: TimesheetReview, admin_user: User) -> dict:
+    return {"$set": {
+        "status": review.status.value,
+        "reviewed_at": datetime.now(timezone.utc),
+        "reviewed_by": admin_user.id,
+        "admin_comment": review.admin_comment
+    }}
+
+@api_router.put("/timesheets/bulk-review")
+async def bulk_review_timesheets(
+    request: TimesheetBulkReview,
+    background_tasks: BackgroundTasks,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Apply one review decision to many timesheets; returns a result per id"""
+    if request.status == TimesheetStatus.DENIED and not request.admin_comment:
+        raise HTTPException(status_code=400, detail="Comment required when denying timesheet")
+    
+    timesheet_ids = list(dict.fromkeys(request.timesheet_ids))
+    if len(timesheet_ids) > BULK_REVIEW_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_REVIEW_MAX_ITEMS} timesheets per request")
+    
+    timesheets = await db.timesheets.find(
+        {"id": {"$in": timesheet_ids}},
+        {"_id": 0, "id": 1, "user_id": 1, "week_start": 1, "status": 1}
+    ).to_list(None)
+    found = {ts['id']: ts for ts in timesheets}
+    failed = {
+        ts_id: "Timesheet is no longer pending"
+        for ts_id, ts in found.items() if ts.get('status') != TimesheetStatus.SUBMITTED.value
+    }
+    to_update = [ts_id for ts_id in timesheet_ids if ts_id in found and ts_id not in failed]
+    
+    review = TimesheetReview(status=request.status, admin_comment=request.admin_comment)
+    if to_update:
+        update = review_update(review, admin_user)
+        write_errors = {}
+        try:
+            result = await db.timesheets.bulk_write(
+                [UpdateOne({"id": ts_id, "status": TimesheetStatus.SUBMITTED.value}, update) for ts_id in to_update],
+                ordered=False
+            )
+            matched = result.matched_count
+        except BulkWriteError as e:
+            write_errors = {to_update[err['index']]: err.get('errmsg', 'Update failed') for err in e.details.get('writeErrors', [])}
+            matched = e.details.get('nMatched', 0)
+        failed.update(write_errors)
+        
+        if matched + len(write_errors) < len(to_update):
+            # Some were reviewed elsewhere between the read and the write; find which ones we updated
+            reviewed = await db.timesheets.find(
+                {"id": {"$in": to_update}, "reviewed_by": admin_user.id, "reviewed_at": update["$set"]["reviewed_at"]},
+                {"_id": 0, "id": 1}
+            ).to_list(None)
+            reviewed_ids = {ts['id'] for ts in reviewed}
+            for ts_id in to_update:
+                if ts_id not in reviewed_ids:
+                    failed.setdefault(ts_id, "Timesheet is no longer pending")
+    
+    results = []
+    notifications = []
+    for ts_id in timesheet_ids:
+        if ts_id not in found:
+            results.append({"id": ts_id, "success": False, "error": "Timesheet not found"})
+        elif ts_id in failed:
+            results.append({"id": ts_id, "success": False, "error": failed[ts_id]})
+        else:
+            results.append({"id": ts_id, "success": True})
+            notifications.append(review_notification(found[ts_id], review))
     
-    return timesheets
+    invalidate_dashboard_stats()
+    send_notifications(background_tasks, notifications)
+    
+    return {
+        "success": len(notifications) == len(timesheet_ids),
+        "updated": len(notifications),
+        "results": results
+    }
 
 @api_router.put("/timesheets/{timesheet_id}/review")
 async def review_timesheet(
     timesheet_id: str,
     review: TimesheetReview,
+    background_tasks: BackgroundTasks,
     admin_user: User = Depends(get_admin_user)
 ):
     timesheet = await db.timesheets.find_one({"id": timesheet_id}, {"_id": 0})
@@ -596,50 +2205,25 @@ async def review_timesheet(
     if review.status == TimesheetStatus.DENIED and not review.admin_comment:
         raise HTTPException(status_code=400, detail="Comment required when denying timesheet")
     
-    now = datetime.now(timezone.utc)
-    await db.timesheets.update_one(
-        {"id": timesheet_id},
-        {"$set": {
-            "status": review.status.value,
-            "reviewed_at": now.isoformat(),
-            "reviewed_by": admin_user.id,
-            "admin_comment": review.admin_comment
-        }}
-    )
+    await db.timesheets.update_one({"id": timesheet_id}, review_update(review, admin_user))
     
-    # Create notification for the employee
-    employee_id = timesheet['user_id']
-    if review.status == TimesheetStatus.APPROVED:
-        notification_type = NotificationType.TIMESHEET_APPROVED
-        title = "Timesheet Approved"
-        message = f"Your timesheet for {timesheet['week_start']} has been approved"
-    else:
-        notification_type = NotificationType.TIMESHEET_DENIED
-        title = "Timesheet Denied"
-        message = f"Your timesheet for {timesheet['week_start']} has been denied"
-        if review.admin_comment:
-            message += f": {review.admin_comment}"
+    invalidate_dashboard_stats()
     
-    await create_notification(
-        user_id=employee_id,
-        notification_type=notification_type,
-        title=title,
-        message=message,
-        related_timesheet_id=timesheet_id
-    )
+    # Create notification for the employee
+    send_notifications(background_tasks, [review_notification(timesheet, review)])
     
     return {"success": True}
 
 # Admin - Employee Management
 @api_router.get("/admin/employees", response_model=List[User])
-async def get_employees(admin_user: User = Depends(get_admin_user)):
-    users = await db.users.find({}, {"_id": 0, "password": 0}).sort("created_at", -1).to_list(1000)
-    
-    for user in users:
-        if isinstance(user['created_at'], str):
-            user['created_at'] = datetime.fromisoformat(user['created_at'])
-    
-    return users
+async def get_employees(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    response: Response = None,
+    admin_user: User = Depends(get_admin_user)
+):
+    users, next_cursor = await fetch_page(db.users, {}, "created_at", limit, cursor, model_projection(User))
+    return paged_response(response, users, next_cursor)
 
 @api_router.post("/admin/employees", response_model=User)
 async def create_employee(employee: UserCreate, admin_user: User = Depends(get_admin_user)):
@@ -657,10 +2241,11 @@ async def create_employee(employee: UserCreate, admin_user: User = Depends(get_a
         default_task=employee.default_task
     )
     
-    user_doc = user.model_dump()
-    user_doc['password'] = hash_password(employee.password)
-    user_doc['created_at'] = user_doc['created_at'].isoformat()
+    user_doc = to_document(user)
+    user_doc['password'] = await hash_password(employee.password)
     await db.users.insert_one(user_doc)
+    await reference_cache.changed("users")
+    invalidate_dashboard_stats()
     
     return user
 
@@ -676,24 +2261,80 @@ async def update_employee(
     
     update_data = update.model_dump(exclude_unset=True)
     if 'password' in update_data:
-        update_data['password'] = hash_password(update_data['password'])
+        update_data['password'] = await hash_password(update_data['password'])
     
     await db.users.update_one({"id": user_id}, {"$set": update_data})
+    user_cache.invalidate(user_id)
+    await reference_cache.changed("users")
+    invalidate_dashboard_stats()
     
     updated_user = await db.users.find_one({"id": user_id}, {"_id": 0})
-    if isinstance(updated_user['created_at'], str):
-        updated_user['created_at'] = datetime.fromisoformat(updated_user['created_at'])
-    
     return User(**updated_user)
 
+@api_router.get("/admin/indexes")
+async def get_index_report(admin_user: User = Depends(get_admin_user)):
+    """Report missing, undeclared and unused indexes"""
+    return await check_indexes()
+
+@api_router.get("/admin/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Most recent slow MongoDB commands on this worker, newest first"""
+    return {
+        "enabled": SLOW_QUERY_ENABLED,
+        **slow_query_recorder.stats(),
+        "queries": slow_query_recorder.recent(limit)
+    }
+
+@api_router.get("/admin/runtime-stats")
+async def get_runtime_stats(admin_user: User = Depends(get_admin_user)):
+    """In-process worker pool and cache statistics"""
+    return {
+        "password_hashing": password_executor.stats(),
+        "pdf_exports": pdf_executor.stats(),
+        "user_cache": {"enabled": USER_CACHE_ENABLED, **user_cache.stats()},
+        "reference_cache": reference_cache.stats(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "notification_streams": notification_broker.stats(),
+        "heartbeats": heartbeat_coalescer.stats()
+    }
+
+def render_metrics() -> str:
+    """All metrics of this worker in Prometheus text exposition format"""
+    lines = request_metrics.render() + mongo_command_metrics.render() + event_loop_monitor.render()
+    pools = {"password_hashing": password_executor, "pdf_exports": pdf_executor}
+    for metric, field, kind, help_text in (
+        ("executor_workers", "workers", "gauge", "Worker threads or processes per pool"),
+        ("executor_running", "running", "gauge", "Jobs currently running per pool"),
+        ("executor_queued", "queued", "gauge", "Jobs waiting for a worker per pool"),
+        ("executor_rejected_total", "rejected", "counter", "Jobs refused with 503 because the queue was full"),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        for pool, executor in pools.items():
+            lines.append(f'{metric}{{pool="{pool}"}} {executor.stats()[field]}')
+    return "\n".join(lines) + "\n"
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint; served outside /api so it is not routed publicly"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Projects Management
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects(current_user: User = Depends(get_current_user)):
-    projects = await db.projects.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    
-    for project in projects:
-        if isinstance(project['created_at'], str):
-            project['created_at'] = datetime.fromisoformat(project['created_at'])
+async def get_projects(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    response: Response = None,
+    current_user: User = Depends(get_current_user)
+):
+    projects = (await reference_cache.get("projects")).values()
+    projects, next_cursor = paginate_list(projects, "created_at", limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return projects
 
@@ -705,9 +2346,10 @@ async def create_project(project: ProjectCreate, admin_user: User = Depends(get_
         created_by=admin_user.id
     )
     
-    project_doc = new_project.model_dump()
-    project_doc['created_at'] = project_doc['created_at'].isoformat()
+    project_doc = to_document(new_project)
     await db.projects.insert_one(project_doc)
+    await reference_cache.changed("projects")
+    invalidate_dashboard_stats()
     
     return new_project
 
@@ -723,25 +2365,27 @@ async def update_project(
     
     update_data = update.model_dump(exclude_unset=True)
     await db.projects.update_one({"id": project_id}, {"$set": update_data})
+    await reference_cache.changed("projects")
     
     updated = await db.projects.find_one({"id": project_id}, {"_id": 0})
-    if isinstance(updated['created_at'], str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    
     return Project(**updated)
 
 # Tasks Management
 @api_router.get("/tasks", response_model=List[Task])
-async def get_tasks(project_id: Optional[str] = None, current_user: User = Depends(get_current_user)):
-    query = {}
+async def get_tasks(
+    project_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    response: Response = None,
+    current_user: User = Depends(get_current_user)
+):
+    tasks = (await reference_cache.get("tasks")).values()
     if project_id:
-        query['project_id'] = project_id
-    
-    tasks = await db.tasks.find(query, {"_id": 0}).sort("created_at", -1).to_list(1000)
+        tasks = [t for t in tasks if t['project_id'] == project_id]
     
-    for task in tasks:
-        if isinstance(task['created_at'], str):
-            task['created_at'] = datetime.fromisoformat(task['created_at'])
+    tasks, next_cursor = paginate_list(tasks, "created_at", limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return tasks
 
@@ -753,9 +2397,9 @@ async def create_task(task: TaskCreate, admin_user: User = Depends(get_admin_use
         project_id=task.project_id
     )
     
-    task_doc = new_task.model_dump()
-    task_doc['created_at'] = task_doc['created_at'].isoformat()
+    task_doc = to_document(new_task)
     await db.tasks.insert_one(task_doc)
+    await reference_cache.changed("tasks")
     
     return new_task
 
@@ -771,14 +2415,61 @@ async def update_task(
     
     update_data = update.model_dump(exclude_unset=True)
     await db.tasks.update_one({"id": task_id}, {"$set": update_data})
+    await reference_cache.changed("tasks")
     
     updated = await db.tasks.find_one({"id": task_id}, {"_id": 0})
-    if isinstance(updated['created_at'], str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    
     return Task(**updated)
 
 # Reports
+# group_by mode -> (entry field, collection holding its label)
+REPORT_GROUPINGS = {
+    "user": ("user_id", "users"),
+    "project": ("project_id", "projects"),
+    "task": ("task_id", "tasks"),
+    "date": ("date", None),
+}
+
+def build_report_pipeline(query: dict, group_by: str) -> List[dict]:
+    """Aggregation over daily_rollups (or raw time_entries) that returns one row per group"""
+    field, label_collection = REPORT_GROUPINGS.get(group_by, (None, None))
+    
+    pipeline = [
+        {"$match": query},
+        {"$group": {
+            "_id": f"${field}" if field else "all",
+            "total_seconds": {"$sum": {"$ifNull": ["$duration", 0]}},
+            "entry_count": {"$sum": {"$ifNull": ["$entry_count", 1]}}
+        }},
+        # Rollup rows emptied by deletes sum to zero entries; raw entries never produce such groups
+        {"$match": {"entry_count": {"$gt": 0}}},
+    ]
+    
+    if label_collection:
+        pipeline.append({"$lookup": {
+            "from": label_collection,
+            "localField": "_id",
+            "foreignField": "id",
+            "as": "ref"
+        }})
+        label = {"$ifNull": [{"$arrayElemAt": ["$ref.name", 0]}, "Unknown"]}
+    elif field:
+        label = "$_id"
+    else:
+        label = "All"
+    
+    pipeline.extend([
+        {"$project": {
+            "_id": 0,
+            "id": "$_id",
+            "label": label,
+            "total_seconds": 1,
+            "total_hours": {"$round": [{"$divide": ["$total_seconds", 3600]}, 2]},
+            "entry_count": 1
+        }},
+        {"$sort": {"label": 1, "id": 1}},
+    ])
+    return pipeline
+
 @api_router.get("/reports/time")
 async def get_time_report(
     start_date: str,
@@ -801,59 +2492,59 @@ async def get_time_report(
     if project_id:
         query['project_id'] = project_id
     
-    # Get entries
-    entries = await db.time_entries.find(query, {"_id": 0}).to_list(10000)
-    
-    # Get related data
-    users = {u['id']: u for u in await db.users.find({}, {"_id": 0}).to_list(1000)}
-    projects = {p['id']: p for p in await db.projects.find({}, {"_id": 0}).to_list(1000)}
-    tasks = {t['id']: t for t in await db.tasks.find({}, {"_id": 0}).to_list(1000)}
-    
-    # Group data
-    grouped = {}
-    for entry in entries:
-        key = None
-        if group_by == "user":
-            key = entry['user_id']
-            label = users.get(key, {}).get('name', 'Unknown')
-        elif group_by == "project":
-            key = entry['project_id']
-            label = projects.get(key, {}).get('name', 'Unknown')
-        elif group_by == "task":
-            key = entry['task_id']
-            label = tasks.get(key, {}).get('name', 'Unknown')
-        elif group_by == "date":
-            key = entry['date']
-            label = entry['date']
-        else:
-            key = "all"
-            label = "All"
-        
-        if key not in grouped:
-            grouped[key] = {
-                "id": key,
-                "label": label,
-                "total_seconds": 0,
-                "total_hours": 0,
-                "entry_count": 0
-            }
-        
-        grouped[key]['total_seconds'] += entry.get('duration', 0)
-        grouped[key]['entry_count'] += 1
-    
-    # Calculate hours
-    for item in grouped.values():
-        item['total_hours'] = round(item['total_seconds'] / 3600, 2)
+    pipeline = build_report_pipeline(query, group_by)
+    source = await rollup_source(reports_db)
+    grouped = await source.aggregate(pipeline).to_list(None)
     
+    total_seconds = sum(g['total_seconds'] for g in grouped)
     return {
-        "data": list(grouped.values()),
+        "data": grouped,
         "summary": {
-            "total_seconds": sum(g['total_seconds'] for g in grouped.values()),
-            "total_hours": round(sum(g['total_seconds'] for g in grouped.values()) / 3600, 2),
-            "total_entries": sum(g['entry_count'] for g in grouped.values())
+            "total_seconds": total_seconds,
+            "total_hours": round(total_seconds / 3600, 2),
+            "total_entries": sum(g['entry_count'] for g in grouped)
         }
     }
 
+def render_pdf_report(start_date: str, end_date: str, rows: List[List[str]], total_seconds: int, omitted: int = 0) -> bytes:
+    """Build the PDF report; runs in a worker process"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    # Title
+    title = Paragraph(f"Time Report ({start_date} to {end_date})", styles['Title'])
+    elements.append(title)
+    if omitted:
+        elements.append(Paragraph(
+            f"Showing the first {len(rows)} entries; {omitted} more are not listed but are included in the total. "
+            "Use the CSV export for the full list.",
+            styles['Normal']
+        ))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    data = [['Date', 'Employee', 'Project', 'Task', 'Duration (hrs)']]
+    data.extend(rows)
+    data.append(['', '', '', 'Total', str(round(total_seconds / 3600, 2))])
+    
+    # LongTable splits across pages and repeats the header row on each one
+    table = LongTable(data, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(table)
+    doc.build(elements)
+    return buffer.getvalue()
+
 @api_router.get("/reports/export/pdf")
 async def export_pdf(
     start_date: str,
@@ -871,70 +2562,68 @@ async def export_pdf(
     elif user_id:
         query['user_id'] = user_id
     
-    # Get entries
-    entries = await db.time_entries.find(query, {"_id": 0}).to_list(10000)
-    
     # Get related data
-    users = {u['id']: u for u in await db.users.find({}, {"_id": 0}).to_list(1000)}
-    projects = {p['id']: p for p in await db.projects.find({}, {"_id": 0}).to_list(1000)}
-    tasks = {t['id']: t for t in await db.tasks.find({}, {"_id": 0}).to_list(1000)}
+    users = await reference_cache.get("users")
+    projects = await reference_cache.get("projects")
+    tasks = await reference_cache.get("tasks")
     
-    # Create PDF
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title = Paragraph(f"Time Report ({start_date} to {end_date})", styles['Title'])
-    elements.append(title)
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Table data
-    data = [['Date', 'Employee', 'Project', 'Task', 'Duration (hrs)']]
+    # Table rows, capped at PDF_EXPORT_MAX_ROWS; the total covers every entry
+    rows = []
     total_seconds = 0
+    omitted = 0
     
-    for entry in entries:
+    cursor = reports_db.time_entries.find(query, EXPORT_ENTRY_PROJECTION).sort("date", 1).batch_size(CSV_EXPORT_BATCH_SIZE)
+    async for entry in cursor:
+        total_seconds += entry.get('duration', 0)
+        if len(rows) >= PDF_EXPORT_MAX_ROWS:
+            omitted += 1
+            continue
+        
         user_name = users.get(entry['user_id'], {}).get('name', 'Unknown')
         project_name = projects.get(entry['project_id'], {}).get('name', 'Unknown')
         task_name = tasks.get(entry['task_id'], {}).get('name', 'Unknown')
         hours = round(entry.get('duration', 0) / 3600, 2)
         
-        data.append([
+        rows.append([
             entry['date'],
             user_name,
             project_name,
             task_name,
             str(hours)
         ])
-        total_seconds += entry.get('duration', 0)
     
-    # Add total
-    data.append(['', '', '', 'Total', str(round(total_seconds / 3600, 2))])
+    # Render in the process pool so the event loop stays free
+    pdf_bytes = await pdf_executor.run(render_pdf_report, start_date, end_date, rows, total_seconds, omitted)
     
-    # Create table
-    table = Table(data)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    elements.append(table)
-    doc.build(elements)
-    
-    buffer.seek(0)
-    return StreamingResponse(
-        buffer,
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename=time_report_{start_date}_{end_date}.pdf"}
     )
 
+async def stream_csv_rows(query: dict, users: dict, projects: dict, tasks: dict):
+    """Yield the CSV export in chunks straight off a cursor, reusing one small buffer"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['Date', 'Employee', 'Project', 'Task', 'Duration (hours)'])
+    
+    cursor = reports_db.time_entries.find(query, EXPORT_ENTRY_PROJECTION).sort("date", 1).batch_size(CSV_EXPORT_BATCH_SIZE)
+    
+    async for entry in cursor:
+        writer.writerow([
+            entry['date'],
+            users.get(entry['user_id'], {}).get('name', 'Unknown'),
+            projects.get(entry['project_id'], {}).get('name', 'Unknown'),
+            tasks.get(entry['task_id'], {}).get('name', 'Unknown'),
+            round(entry.get('duration', 0) / 3600, 2)
+        ])
+        if buffer.tell() >= CSV_EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
 @api_router.get("/reports/export/csv")
 async def export_csv(
     start_date: str,
@@ -952,27 +2641,13 @@ async def export_csv(
     elif user_id:
         query['user_id'] = user_id
     
-    # Get entries
-    entries = await db.time_entries.find(query, {"_id": 0}).to_list(10000)
-    
     # Get related data
-    users = {u['id']: u for u in await db.users.find({}, {"_id": 0}).to_list(1000)}
-    projects = {p['id']: p for p in await db.projects.find({}, {"_id": 0}).to_list(1000)}
-    tasks = {t['id']: t for t in await db.tasks.find({}, {"_id": 0}).to_list(1000)}
-    
-    # Build CSV
-    csv_data = "Date,Employee,Project,Task,Duration (hours)\n"
-    
-    for entry in entries:
-        user_name = users.get(entry['user_id'], {}).get('name', 'Unknown')
-        project_name = projects.get(entry['project_id'], {}).get('name', 'Unknown')
-        task_name = tasks.get(entry['task_id'], {}).get('name', 'Unknown')
-        hours = round(entry.get('duration', 0) / 3600, 2)
-        
-        csv_data += f"{entry['date']},{user_name},{project_name},{task_name},{hours}\n"
+    users = await reference_cache.get("users")
+    projects = await reference_cache.get("projects")
+    tasks = await reference_cache.get("tasks")
     
     return StreamingResponse(
-        iter([csv_data]),
+        stream_csv_rows(query, users, projects, tasks),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename=time_report_{start_date}_{end_date}.csv"}
     )
@@ -980,71 +2655,183 @@ async def export_csv(
 # Dashboard stats
 @api_router.get("/dashboard/stats")
 async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
-    if current_user.role == UserRole.ADMIN:
-        # Admin stats
-        total_employees = await db.users.count_documents({"role": UserRole.EMPLOYEE.value})
-        active_employees = await db.users.count_documents({"role": UserRole.EMPLOYEE.value, "status": UserStatus.ACTIVE.value})
-        pending_timesheets = await db.timesheets.count_documents({"status": TimesheetStatus.SUBMITTED.value})
-        total_projects = await db.projects.count_documents({})
-        
-        # Active timers
-        active_timers = await db.timer_sessions.count_documents({"is_active": True})
-        
-        return {
-            "total_employees": total_employees,
-            "active_employees": active_employees,
-            "pending_timesheets": pending_timesheets,
-            "total_projects": total_projects,
-            "active_timers": active_timers
-        }
-    else:
-        # Employee stats
-        today = datetime.now(timezone.utc).date().isoformat()
-        week_start = (datetime.now(timezone.utc).date() - timedelta(days=datetime.now(timezone.utc).weekday())).isoformat()
-        
-        today_entries = await db.time_entries.find({"user_id": current_user.id, "date": today}, {"_id": 0}).to_list(1000)
-        today_seconds = sum(e.get('duration', 0) for e in today_entries)
-        
-        week_entries = await db.time_entries.find({
-            "user_id": current_user.id,
-            "date": {"$gte": week_start}
-        }, {"_id": 0}).to_list(1000)
-        week_seconds = sum(e.get('duration', 0) for e in week_entries)
-        
-        return {
-            "today_hours": round(today_seconds / 3600, 2),
-            "week_hours": round(week_seconds / 3600, 2),
-            "total_entries": len(week_entries)
-        }
+    cache_key = ADMIN_DASHBOARD_KEY if current_user.role == UserRole.ADMIN else current_user.id
+    stats = dashboard_cache.get(cache_key)
+    if stats is None:
+        if current_user.role == UserRole.ADMIN:
+            stats = await compute_admin_stats()
+        else:
+            stats = await compute_employee_stats(current_user.id)
+        dashboard_cache.set(cache_key, stats)
+    return stats
+
+async def compute_admin_stats() -> dict:
+    (
+        total_employees,
+        active_employees,
+        pending_timesheets,
+        total_projects,
+        active_timers
+    ) = await asyncio.gather(
+        db.users.count_documents({"role": UserRole.EMPLOYEE.value}),
+        db.users.count_documents({"role": UserRole.EMPLOYEE.value, "status": UserStatus.ACTIVE.value}),
+        db.timesheets.count_documents({"status": TimesheetStatus.SUBMITTED.value}),
+        db.projects.count_documents({}),
+        db.timer_sessions.count_documents({"is_active": True})
+    )
+    
+    return {
+        "total_employees": total_employees,
+        "active_employees": active_employees,
+        "pending_timesheets": pending_timesheets,
+        "total_projects": total_projects,
+        "active_timers": active_timers
+    }
+
+async def compute_employee_stats(user_id: str) -> dict:
+    today = datetime.now(timezone.utc).date()
+    week_start = (today - timedelta(days=today.weekday())).isoformat()
+    
+    source = await rollup_source()
+    totals = await source.aggregate([
+        {"$match": {"user_id": user_id, "date": {"$gte": week_start}}},
+        {"$group": {
+            "_id": None,
+            "today_seconds": {"$sum": {"$cond": [{"$eq": ["$date", today.isoformat()]}, {"$ifNull": ["$duration", 0]}, 0]}},
+            "week_seconds": {"$sum": {"$ifNull": ["$duration", 0]}},
+            "entry_count": {"$sum": {"$ifNull": ["$entry_count", 1]}}
+        }}
+    ]).to_list(1)
+    totals = totals[0] if totals else {"today_seconds": 0, "week_seconds": 0, "entry_count": 0}
+    
+    return {
+        "today_hours": round(totals['today_seconds'] / 3600, 2),
+        "week_hours": round(totals['week_seconds'] / 3600, 2),
+        "total_entries": totals['entry_count']
+    }
 
 
 # Notification routes
 @api_router.get("/notifications", response_model=List[Notification])
 async def get_notifications(
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    response: Response = None,
     current_user: User = Depends(get_current_user)
 ):
     """Get user's notifications"""
-    notifications = await db.notifications.find(
-        {"user_id": current_user.id},
-        {"_id": 0}
-    ).sort("created_at", -1).limit(limit).to_list(limit)
-    
-    # Parse datetime strings
-    for notif in notifications:
-        if isinstance(notif['created_at'], str):
-            notif['created_at'] = datetime.fromisoformat(notif['created_at'])
+    notifications, next_cursor = await fetch_page(
+        db.notifications, {"user_id": current_user.id}, "created_at", limit, cursor, model_projection(Notification)
+    )
+    return paged_response(response, notifications, next_cursor)
+
+def format_sse_event(notification: Notification) -> str:
+    return f"id: {notification.id}\nevent: notification\ndata: {notification.model_dump_json()}\n\n"
+
+async def stream_notifications(request: Request, user_id: str, last_event_id: Optional[str]):
+    """SSE generator: replays anything missed since last_event_id, then relays new notifications.
+    
+    Notifications created on this worker arrive through the broker immediately; on every heartbeat
+    the stream also reads the collection, which picks up those created on other workers.
+    """
+    subscription = notification_broker.subscribe(user_id)
+    # Recently sent ids, so broker and collection reads never send the same notification twice
+    sent: OrderedDict = OrderedDict()
+    
+    def first_send(notification_id: str) -> bool:
+        if notification_id in sent:
+            return False
+        sent[notification_id] = True
+        if len(sent) > SSE_REPLAY_LIMIT * 2:
+            sent.popitem(last=False)
+        return True
+    
+    async def read_since(since: datetime) -> List[dict]:
+        return await db.notifications.find(
+            {"user_id": user_id, "created_at": {"$gt": since}},
+            {"_id": 0}
+        ).sort("created_at", 1).limit(SSE_REPLAY_LIMIT).to_list(SSE_REPLAY_LIMIT)
     
-    return notifications
+    try:
+        yield "retry: 3000\n\n"  # client reconnect delay in ms
+        
+        # Subscribed before replaying, so nothing created in between is lost
+        since = datetime.now(timezone.utc)
+        if last_event_id:
+            last = await db.notifications.find_one(
+                {"id": last_event_id, "user_id": user_id},
+                {"_id": 0, "created_at": 1}
+            )
+            if last:
+                since = as_datetime(last['created_at'])
+                sent[last_event_id] = True
+                for doc in await read_since(since):
+                    if first_send(doc['id']):
+                        yield format_sse_event(Notification(**doc))
+        
+        while not subscription.overflowed:
+            try:
+                notification = await asyncio.wait_for(subscription.queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                
+                checked_at = datetime.now(timezone.utc)
+                for doc in await read_since(since - timedelta(seconds=SSE_CATCHUP_OVERLAP_SECONDS)):
+                    if first_send(doc['id']):
+                        yield format_sse_event(Notification(**doc))
+                since = checked_at
+                yield ": heartbeat\n\n"
+                continue
+            
+            if first_send(notification.id):
+                yield format_sse_event(notification)
+    finally:
+        notification_broker.unsubscribe(user_id, subscription)
+
+@api_router.post("/notifications/stream-ticket")
+async def create_stream_ticket(current_user: User = Depends(get_current_user)):
+    """Short-lived token for opening the notification stream, which cannot send an Authorization header"""
+    ticket = create_access_token(
+        {"sub": current_user.id, "scope": SSE_TICKET_SCOPE},
+        expires_delta=timedelta(seconds=SSE_TICKET_EXPIRE_SECONDS)
+    )
+    return {"ticket": ticket, "expires_in": SSE_TICKET_EXPIRE_SECONDS}
+
+@api_router.get("/notifications/stream")
+async def notifications_stream(
+    request: Request,
+    ticket: str = Query(..., description="Ticket from POST /notifications/stream-ticket"),
+    last_event_id: Optional[str] = Query(None, description="Resume point when reconnecting with a new ticket"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """Stream the user's new notifications as Server-Sent Events"""
+    user = await authenticate_token(ticket, scope=SSE_TICKET_SCOPE)
+    # The browser's own reconnect sends the header; a fresh EventSource can only use the query string
+    return StreamingResponse(
+        stream_notifications(request, user.id, last_event_id_header or last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @api_router.get("/notifications/unread-count")
 async def get_unread_count(current_user: User = Depends(get_current_user)):
     """Get count of unread notifications"""
-    count = await db.notifications.count_documents({
-        "user_id": current_user.id,
-        "read": False
-    })
-    return {"count": count}
+    counter = await db.notification_counters.find_one({"user_id": current_user.id}, {"_id": 0, "unread": 1})
+    if counter is None:
+        # First read for this user: seed the counter from the notifications themselves
+        count = await db.notifications.count_documents({
+            "user_id": current_user.id,
+            "read": False
+        })
+        await db.notification_counters.update_one(
+            {"user_id": current_user.id},
+            {"$setOnInsert": {"unread": count}, "$currentDate": {"updated_at": True}},
+            upsert=True
+        )
+        return {"count": count}
+    
+    return {"count": max(0, counter['unread'])}
 
 @api_router.put("/notifications/{notification_id}/read")
 async def mark_notification_read(
@@ -1052,19 +2839,19 @@ async def mark_notification_read(
     current_user: User = Depends(get_current_user)
 ):
     """Mark a notification as read"""
-    notification = await db.notifications.find_one({
-        "id": notification_id,
-        "user_id": current_user.id
-    }, {"_id": 0})
-    
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    
-    await db.notifications.update_one(
-        {"id": notification_id},
+    result = await db.notifications.update_one(
+        {"id": notification_id, "user_id": current_user.id, "read": False},
         {"$set": {"read": True}}
     )
     
+    if result.modified_count:
+        await db.notification_counters.update_one(
+            {"user_id": current_user.id},
+            {"$inc": {"unread": -1}, "$currentDate": {"updated_at": True}}
+        )
+    elif not await db.notifications.find_one({"id": notification_id, "user_id": current_user.id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Notification not found")
+    
     return {"success": True}
 
 @api_router.put("/notifications/mark-all-read")
@@ -1074,13 +2861,144 @@ async def mark_all_notifications_read(current_user: User = Depends(get_current_u
         {"user_id": current_user.id, "read": False},
         {"$set": {"read": True}}
     )
+    await db.notification_counters.update_one(
+        {"user_id": current_user.id},
+        {"$set": {"unread": 0}, "$currentDate": {"updated_at": True}},
+        upsert=True
+    )
     
     return {"success": True}
 
 
+# Background jobs
+background_jobs: List[asyncio.Task] = []
+
+async def run_periodically(name: str, interval_seconds: float, job, run_first: bool = False):
+    """Run job every interval_seconds until cancelled, logging (not propagating) failures"""
+    if not run_first:
+        await asyncio.sleep(interval_seconds)
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logging.exception(f"Background job {name} failed")
+        await asyncio.sleep(interval_seconds)
+
+def start_background_job(name: str, interval_seconds: float, job, run_first: bool = False):
+    background_jobs.append(asyncio.create_task(run_periodically(name, interval_seconds, job, run_first), name=name))
+
+async def acquire_lease(name: str, ttl_seconds: float) -> bool:
+    """Take or renew a named lease so only one worker runs a job at a time"""
+    if worker_id is None:
+        assign_worker_id()
+    now = datetime.now(timezone.utc)
+    try:
+        await db.job_leases.find_one_and_update(
+            {"_id": name, "$or": [{"expires_at": {"$lte": now}}, {"holder": worker_id}]},
+            {"$set": {"holder": worker_id, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Another worker holds an unexpired lease, so the upsert collided with its document
+        return False
+    return True
+
+async def reap_stale_timers():
+    """Stop timers whose heartbeat went stale, ending them at the last heartbeat"""
+    if not await acquire_lease("timer_reaper", TIMER_REAPER_INTERVAL_SECONDS):
+        return
+    
+    # Make sure heartbeats received by this worker are visible first
+    await heartbeat_coalescer.flush()
+    
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=TIMER_STALE_AFTER_SECONDS)
+    stale_query = {"is_active": True, "last_heartbeat": {"$lt": cutoff}}
+    
+    stale = await db.timer_sessions.find(stale_query, {"_id": 0, "id": 1}).limit(TIMER_REAPER_BATCH_SIZE).to_list(TIMER_REAPER_BATCH_SIZE)
+    if stale:
+        await close_stale_sessions(stale_query, stale, now)
+    await write_reaped_entries()
+
+async def close_stale_sessions(stale_query: dict, stale: List[dict], now: datetime):
+    # Re-applying stale_query means a manual stop or heartbeat that landed since the read wins.
+    # Sessions stay marked entry_written=False until their entry exists, so a failed insert is retried.
+    await db.timer_sessions.update_many(
+        {**stale_query, "id": {"$in": [t['id'] for t in stale]}},
+        {"$set": {
+            "is_active": False,
+            "auto_stopped": True,
+            "entry_written": False,
+            "stopped_at": now
+        }}
+    )
+
+def reaped_entry_id(session_id: str) -> str:
+    """Deterministic time entry id for a reaped session, so retried inserts cannot duplicate it"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"reaped-timer:{session_id}"))
+
+async def write_reaped_entries():
+    """Create the time entries of reaped sessions that do not have one yet"""
+    pending = await db.timer_sessions.find(
+        {"auto_stopped": True, "entry_written": False},
+        {"_id": 0}
+    ).limit(TIMER_REAPER_BATCH_SIZE).to_list(TIMER_REAPER_BATCH_SIZE)
+    if not pending:
+        return
+    
+    entry_docs = []
+    for timer_doc in pending:
+        start_time = as_datetime(timer_doc['start_time'])
+        end_time = max(start_time, as_datetime(timer_doc['last_heartbeat']))
+        time_entry = TimeEntry(
+            id=reaped_entry_id(timer_doc['id']),
+            user_id=timer_doc['user_id'],
+            project_id=timer_doc['project_id'],
+            task_id=timer_doc['task_id'],
+            start_time=start_time,
+            end_time=end_time,
+            duration=int((end_time - start_time).total_seconds()),
+            entry_type=EntryType.TIMER,
+            date=timer_doc['date'],
+            notes="Automatically stopped after the timer stopped sending heartbeats"
+        )
+        entry_docs.append(to_document(time_entry))
+    
+    # Duplicates are entries an earlier attempt inserted before failing to mark its sessions
+    duplicates, failed = set(), set()
+    try:
+        await db.time_entries.insert_many(entry_docs, ordered=False)
+    except BulkWriteError as e:
+        for err in e.details.get('writeErrors', []):
+            (duplicates if err.get('code') == 11000 else failed).add(err['index'])
+        if failed:
+            logging.error(f"Failed to write {len(failed)} auto-stopped time entries; they will be retried")
+    
+    inserted = [doc for index, doc in enumerate(entry_docs) if index not in duplicates and index not in failed]
+    await apply_rollup_deltas(inserted)
+    
+    written = [(pending[index]['id'], doc['id']) for index, doc in enumerate(entry_docs) if index not in failed]
+    if written:
+        await db.timer_sessions.bulk_write([
+            UpdateOne({"id": session_id}, {"$set": {"entry_written": True, "time_entry_id": entry_id}})
+            for session_id, entry_id in written
+        ], ordered=False)
+    logging.info(f"Auto-stopped {len(inserted)} stale timers")
+
+async def stop_background_jobs():
+    for task in background_jobs:
+        task.cancel()
+    await asyncio.gather(*background_jobs, return_exceptions=True)
+    background_jobs.clear()
+
+
 # Include router
 app.include_router(api_router)
 
+app.add_middleware(MetricsMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -1088,6 +3006,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Logging
@@ -1099,9 +3018,25 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("startup")
 async def startup_event():
+    assign_worker_id()
+    connect_mongo()
+    await ensure_indexes()
+    await check_indexes()
+    await check_datetime_migration()
     await init_default_admin()
+    start_background_job("backfill_daily_rollups", ROLLUP_BACKFILL_RETRY_SECONDS, backfill_daily_rollups, run_first=True)
+    start_background_job("flush_heartbeats", HEARTBEAT_FLUSH_INTERVAL_SECONDS, heartbeat_coalescer.flush)
+    start_background_job("reap_stale_timers", TIMER_REAPER_INTERVAL_SECONDS, reap_stale_timers)
+    start_background_job("reconcile_unread_counters", NOTIFICATION_RECONCILE_INTERVAL_SECONDS, reconcile_unread_counters)
+    slow_query_recorder.loop = asyncio.get_running_loop()
+    if METRICS_ENABLED:
+        start_background_job("event_loop_lag", EVENT_LOOP_LAG_INTERVAL_SECONDS, event_loop_monitor.probe)
     logger.info("Omni Gratum Time Tracking System started")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    await stop_background_jobs()
+    await heartbeat_coalescer.flush()
+    password_executor.shutdown()
+    pdf_executor.shutdown()
+    close_mongo()
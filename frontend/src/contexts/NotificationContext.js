@@ -84,7 +84,8 @@ export const NotificationProvider = ({ children }) => {
     }
   };
 
-  // Polling: fetch notifications and unread count every 30 seconds
+  // Live updates over Server-Sent Events. Polling runs every 30 seconds while the stream is
+  // down and every 5 minutes while it is up, as a resync in case the stream misses something.
   useEffect(() => {
     if (!user || !token) return;
 
@@ -92,16 +93,79 @@ export const NotificationProvider = ({ children }) => {
     fetchNotifications();
     fetchUnreadCount();
 
-    // Set up polling
+    let streamConnected = false;
+    let source = null;
+    let reconnectTimer = null;
+    let closed = false;
+    let lastPoll = Date.now();
+    // Id of the last event received, so a new stream resumes where the previous one stopped
+    let lastEventId = null;
+
+    // The stream authenticates with a short-lived ticket, so the access token never
+    // appears in a URL (and in access logs)
+    const connect = async () => {
+      if (closed || typeof EventSource === 'undefined') return;
+      try {
+        const response = await axios.post(`${API_URL}/api/notifications/stream-ticket`, {}, {
+          headers: { Authorization: `Bearer ${token}` },
+        });
+        if (closed) return;
+        let url = `${API_URL}/api/notifications/stream?ticket=${encodeURIComponent(response.data.ticket)}`;
+        if (lastEventId) {
+          url += `&last_event_id=${encodeURIComponent(lastEventId)}`;
+        }
+        source = new EventSource(url);
+      } catch (error) {
+        reconnectTimer = setTimeout(connect, 30000);
+        return;
+      }
+
+      source.onopen = () => {
+        streamConnected = true;
+        // Resync after (re)connecting in case anything was missed while offline
+        fetchNotifications();
+        fetchUnreadCount();
+      };
+
+      source.onerror = () => {
+        streamConnected = false;
+        // Reconnects reuse the URL, whose ticket has expired by then; once the browser
+        // gives up, open a new stream with a fresh ticket
+        if (source.readyState === EventSource.CLOSED) {
+          source.close();
+          reconnectTimer = setTimeout(connect, 3000);
+        }
+      };
+
+      source.addEventListener('notification', (event) => {
+        const notification = JSON.parse(event.data);
+        if (event.lastEventId) {
+          lastEventId = event.lastEventId;
+        }
+        setNotifications(prev => [notification, ...prev.filter(n => n.id !== notification.id)]);
+        fetchUnreadCount();
+      });
+    };
+
+    connect();
+
     const interval = setInterval(() => {
+      const pollEvery = streamConnected ? 300000 : 30000;
+      if (Date.now() - lastPoll < pollEvery) return;
+      lastPoll = Date.now();
       fetchUnreadCount();
       if (document.visibilityState === 'visible') {
         fetchNotifications();
       }
     }, 30000); // 30 seconds
 
-    return () => clearInterval(interval);
-  }, [user, token, fetchNotifications, fetchUnreadCount]);
+    return () => {
+      closed = true;
+      clearInterval(interval);
+      clearTimeout(reconnectTimer);
+      if (source) source.close();
+    };
+  }, [user, token, API_URL, fetchNotifications, fetchUnreadCount]);
 
   const value = {
     notifications,
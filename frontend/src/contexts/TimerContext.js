@@ -8,6 +8,28 @@ const TimerContext = createContext();
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// Sent with timer start/stop so a retried request returns the original result
+const newIdempotencyKey = () =>
+  (window.crypto && window.crypto.randomUUID)
+    ? window.crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
+const RETRY_DELAYS_MS = [1000, 3000];
+
+// POST with one idempotency key for the whole action, retrying network errors and 5xx responses
+const postIdempotent = async (url, body, token) => {
+  const headers = { Authorization: `Bearer ${token}`, 'Idempotency-Key': newIdempotencyKey() };
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await axios.post(url, body, { headers });
+    } catch (error) {
+      const retryable = !error.response || error.response.status >= 500;
+      if (!retryable || attempt >= RETRY_DELAYS_MS.length) throw error;
+      await new Promise(resolve => setTimeout(resolve, RETRY_DELAYS_MS[attempt]));
+    }
+  }
+};
+
 export const TimerProvider = ({ children }) => {
   const { user, token } = useAuth();
   const [activeTimer, setActiveTimer] = useState(null);
@@ -70,10 +92,10 @@ export const TimerProvider = ({ children }) => {
 
   const startTimer = async (projectId, taskId) => {
     try {
-      const response = await axios.post(
+      const response = await postIdempotent(
         `${API}/timer/start`,
         { project_id: projectId, task_id: taskId },
-        { headers: { Authorization: `Bearer ${token}` } }
+        token
       );
       setActiveTimer(response.data.timer);
       setIsRunning(true);
@@ -88,11 +110,7 @@ export const TimerProvider = ({ children }) => {
 
   const stopTimer = async (notes = '') => {
     try {
-      await axios.post(
-        `${API}/timer/stop`,
-        { notes },
-        { headers: { Authorization: `Bearer ${token}` } }
-      );
+      await postIdempotent(`${API}/timer/stop`, { notes }, token);
       setActiveTimer(null);
       setIsRunning(false);
       setElapsed(0);
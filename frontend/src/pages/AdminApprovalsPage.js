@@ -74,6 +74,28 @@ export const AdminApprovalsPage = () => {
     }
   };
 
+  const handleApproveAll = async () => {
+    if (!window.confirm(`Approve all ${timesheets.length} pending timesheets?`)) return;
+    
+    try {
+      const response = await axios.put(`${API}/timesheets/bulk-review`, {
+        timesheet_ids: timesheets.map(t => t.id),
+        status: 'approved'
+      }, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      const approved = response.data.updated;
+      const skipped = response.data.results.length - approved;
+      toast.success(`${approved} timesheets approved`);
+      if (skipped > 0) {
+        toast.error(`${skipped} timesheets could not be approved`);
+      }
+      fetchTimesheets();
+    } catch (error) {
+      toast.error('Failed to approve timesheets');
+    }
+  };
+
   const openReviewDialog = (timesheet, action) => {
     setSelectedTimesheet(timesheet);
     setReviewAction(action);
@@ -104,6 +126,12 @@ export const AdminApprovalsPage = () => {
             <div className="text-3xl font-bold">{timesheets.length}</div>
             <div className="text-sm text-muted-foreground mt-1">Pending Approvals</div>
           </div>
+          {timesheets.length > 0 && (
+            <Button onClick={handleApproveAll} data-testid="approve-all-btn">
+              <Check className="h-4 w-4 mr-1" />
+              Approve All
+            </Button>
+          )}
         </div>
       </div>
 
@@ -194,6 +222,19 @@ export const AdminApprovalsPage = () => {
                 </div>
                 <div className="text-sm text-muted-foreground mb-1">Total Hours</div>
                 <div className="font-medium">{selectedTimesheet.total_hours}h</div>
+                {selectedTimesheet.breakdown && selectedTimesheet.breakdown.length > 0 && (
+                  <table className="w-full text-sm mt-3" data-testid="timesheet-breakdown">
+                    <tbody>
+                      {selectedTimesheet.breakdown.map((item) => (
+                        <tr key={`${item.date}-${item.project_id}`}>
+                          <td className="py-1 text-muted-foreground">{item.date}</td>
+                          <td className="py-1">{item.project_name}</td>
+                          <td className="py-1 text-right font-medium">{item.hours}h</td>
+                        </tr>
+                      ))}
+                    </tbody>
+                  </table>
+                )}
               </div>
             )}
 
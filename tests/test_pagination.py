@@ -0,0 +1,99 @@
+import asyncio
+import base64
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+START = datetime(2025, 1, 6, 9, 0, tzinfo=timezone.utc)
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def test_cursor_round_trips_datetimes():
+    cursor = server.encode_cursor({"id": "e1", "start_time": START}, "start_time")
+    assert server.decode_cursor(cursor) == (START, "e1")
+
+
+def test_cursor_round_trips_strings():
+    cursor = server.encode_cursor({"id": "e1", "date": "2025-01-06"}, "date")
+    assert server.decode_cursor(cursor) == ("2025-01-06", "e1")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor({"a": 1, "b": 2}),
+    raw_cursor([1]),
+    raw_cursor([{"$date": 5}, "x"]),
+    raw_cursor([{"$date": "not a date"}, "x"]),
+    raw_cursor([{"$gt": ""}, "x"]),
+    raw_cursor([["2025-01-06"], "x"]),
+    raw_cursor([True, "x"]),
+    raw_cursor(["2025-01-06", {"$ne": None}]),
+    raw_cursor(["2025-01-06", 5]),
+])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        server.decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+def make_entries(count: int) -> list:
+    # Pairs of entries share a start_time, so pages have to break ties on id
+    return [
+        {"id": f"e{i:02d}", "user_id": "u1", "start_time": START + timedelta(minutes=i // 2)}
+        for i in range(count)
+    ]
+
+
+def fetch_all_pages(collection, limit: int) -> list:
+    pages, cursor = [], None
+    while True:
+        docs, cursor = asyncio.run(server.fetch_page(
+            collection, {"user_id": "u1"}, "start_time", limit, cursor, {"_id": 0, "id": 1, "start_time": 1}
+        ))
+        pages.append([doc["id"] for doc in docs])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 20])
+def test_pages_cover_every_entry_once_in_order(limit):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    collection = mongomock_motor.AsyncMongoMockClient(tz_aware=True)["paging_test"].time_entries
+    entries = make_entries(7)
+    asyncio.run(collection.insert_many([dict(entry) for entry in entries]))
+
+    pages = fetch_all_pages(collection, limit)
+
+    expected = [entry["id"] for entry in sorted(entries, key=lambda e: (e["start_time"], e["id"]), reverse=True)]
+    assert [entry_id for page in pages for entry_id in page] == expected
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_invalid_cursor_returns_400():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from fastapi.testclient import TestClient
+
+    saved_db = server.db
+    server.db = mongomock_motor.AsyncMongoMockClient(tz_aware=True)["paging_test"]
+    server.app.dependency_overrides[server.get_current_user] = lambda: server.User(
+        id="u1", email="jane@example.com", name="Jane", role=server.UserRole.EMPLOYEE
+    )
+    try:
+        client = TestClient(server.app)
+        response = client.get("/api/time-entries", params={"cursor": raw_cursor([{"$date": 5}, "x"])})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+    finally:
+        server.app.dependency_overrides.clear()
+        server.db = saved_db
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+USER = {"id": "u1", "email": "Jane@Example.com"}
+PROJECT = {"id": "p1", "name": "Website"}
+TASK = {"id": "t1", "name": "Design", "project_id": "p1"}
+
+
+@pytest.fixture
+def resolver():
+    return server.ImportResolver({"u1": USER}, {"p1": PROJECT}, {"t1": TASK})
+
+
+def make_row(**overrides):
+    row = {
+        "user_email": "jane@example.com",
+        "project": "website",
+        "task": "design",
+        "start_time": "2025-01-06T09:00:00Z",
+        "end_time": "2025-01-06T10:30:00Z",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_resolves_names_case_insensitively(resolver):
+    assert resolver.resolve(make_row()) == ("u1", "p1", "t1")
+
+
+def test_resolves_ids(resolver):
+    row = make_row(user_email=None, project=None, task=None, user_id="u1", project_id="p1", task_id="t1")
+    assert resolver.resolve(row) == ("u1", "p1", "t1")
+
+
+@pytest.mark.parametrize("field", ["user_email", "project", "task", "user_id", "notes", "date"])
+def test_non_string_column_is_a_row_error(resolver, field):
+    with pytest.raises(ValueError, match=f"{field} must be a string"):
+        server.build_import_entry(make_row(**{field: 5}), resolver)
+
+
+def test_unknown_project(resolver):
+    with pytest.raises(ValueError, match="unknown project"):
+        resolver.resolve(make_row(project="Other"))
+
+
+def test_task_must_belong_to_project():
+    other_project = {"id": "p2", "name": "Mobile"}
+    resolver = server.ImportResolver({"u1": USER}, {"p1": PROJECT, "p2": other_project}, {"t1": TASK})
+    with pytest.raises(ValueError, match="unknown task"):
+        resolver.resolve(make_row(project="mobile", task_id="t1"))
+
+
+def test_duration_defaults_to_time_span(resolver):
+    entry = server.build_import_entry(make_row(), resolver)
+    assert entry["duration"] == 5400
+    assert entry["date"] == "2025-01-06"
+    assert entry["entry_type"] == "manual"
+
+
+def test_explicit_duration_and_date(resolver):
+    entry = server.build_import_entry(make_row(duration="3600", date="2025-01-07"), resolver)
+    assert entry["duration"] == 3600
+    assert entry["date"] == "2025-01-07"
+
+
+@pytest.mark.parametrize("duration", [-1, "-60"])
+def test_negative_duration_rejected(resolver, duration):
+    with pytest.raises(ValueError, match="must not be negative"):
+        server.build_import_entry(make_row(duration=duration), resolver)
+
+
+@pytest.mark.parametrize("value", ["not-a-date", "2025-1-6", "20250106", "2025-02-30"])
+def test_malformed_date_rejected(resolver, value):
+    with pytest.raises(ValueError):
+        server.build_import_entry(make_row(date=value), resolver)
+
+
+def test_end_before_start_rejected(resolver):
+    with pytest.raises(ValueError, match="before start_time"):
+        server.build_import_entry(make_row(end_time="2025-01-06T08:00:00Z"), resolver)
+
+
+def test_missing_timestamp_rejected(resolver):
+    with pytest.raises(ValueError, match="start_time must be an ISO 8601 timestamp"):
+        server.build_import_entry(make_row(start_time=None), resolver)
+
+
+def test_import_reports_bad_rows_and_keeps_the_rest():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from fastapi.testclient import TestClient
+
+    database = mongomock_motor.AsyncMongoMockClient(tz_aware=True)["import_test"]
+    saved_db = server.db
+    server.db = database
+    server.app.dependency_overrides[server.get_admin_user] = lambda: None
+    try:
+        client = TestClient(server.app)
+        valid = {"user_id": "u1", "project_id": "p1", "task_id": "t1",
+                 "start_time": "2025-01-06T09:00:00Z", "end_time": "2025-01-06T10:00:00Z"}
+        asyncio.run(database.users.insert_one(dict(USER)))
+        asyncio.run(database.projects.insert_one(dict(PROJECT)))
+        asyncio.run(database.tasks.insert_one(dict(TASK)))
+        lines = [
+            json.dumps(valid),
+            json.dumps({**valid, "user_id": None, "user_email": 5}),
+            json.dumps({**valid, "date": "not-a-date"}),
+            json.dumps({**valid, "duration": -5}),
+            "[1, 2]",
+            json.dumps(valid),
+        ]
+        response = client.post(
+            "/api/admin/time-entries/import",
+            files={"file": ("entries.ndjson", "\n".join(lines).encode())},
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert result["inserted"] == 2
+        assert result["failed"] == 4
+        assert [error["row"] for error in result["errors"]] == [2, 3, 4, 5]
+    finally:
+        server.app.dependency_overrides.clear()
+        server.db = saved_db
+        for name in ("users", "projects", "tasks"):
+            server.reference_cache.invalidate(name)